@@ -3,29 +3,36 @@ Analysis Graph Module
 Constructs and compiles the LangGraph workflow for sector analysis
 """
 from langgraph.graph import StateGraph, END
-from datetime import datetime
+from typing import Dict, Tuple
+from dataclasses import asdict
+import asyncio
+import functools
 import logging
 
 from analysis_engine.graph_state import AnalysisState
+from analysis_engine.templates import render_error
 from analysis_engine.nodes.collector_node import collector_node
 from analysis_engine.nodes.analyzer_node import analyzer_node
+from analysis_engine.nodes.combined_node import combined_node
 from analysis_engine.nodes.critic_node import critic_node
 from analysis_engine.nodes.refiner_node import refiner_node
 from analysis_engine.nodes.formatter_node import formatter_node
 from app.core.config import settings
+from app.core.clock import iso_now
 
 logger = logging.getLogger(__name__)
 
+# In-flight workflows keyed by (sector, country); concurrent callers share one run
+_inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+
 
 def should_continue_refinement(state: AnalysisState) -> str:
     """
     Conditional edge: Determines if report needs refinement or is complete
     
-    Logic:
-    - If critique is PASS OR iterations >= max: Go to FORMATTER
-    - If critique is FAIL AND iterations < max: Go to REFINER
-    
-    This prevents infinite loops while allowing quality improvements.
+    The critic (or fused combined) node already decided (PASS or max
+    iterations → FORMATTER, otherwise → REFINER) and recorded the result
+    in next_node.
     
     Args:
         state: Current analysis state
@@ -33,30 +40,7 @@ def should_continue_refinement(state: AnalysisState) -> str:
     Returns:
         "format" to go to formatter or "refine" to continue refinement
     """
-    critique = state.get('critique', {'decision': 'PASS'})
-    iterations = state.get('iterations', 0)
-    max_iterations = settings.max_refinement_iterations
-    
-    # Safety: Max iteration limit
-    if iterations >= max_iterations:
-        logger.info(f"[DECISION] Max iterations reached ({iterations}), proceeding to FORMATTER")
-        return "format"
-    
-    # Check if report passed (handle both dict and legacy string formats)
-    if isinstance(critique, dict):
-        decision = critique.get('decision', 'PASS').upper()
-        passed = decision == 'PASS'
-    else:
-        # Legacy string format fallback
-        passed = "PASS" in str(critique).upper()
-    
-    if passed:
-        logger.info(f"[DECISION] Report passed review, proceeding to FORMATTER")
-        return "format"
-    
-    # Needs refinement
-    logger.info(f"[DECISION] Report needs refinement (iteration {iterations + 1})")
-    return "refine"
+    return state.next_node or "format"
 
 
 def create_analysis_graph() -> StateGraph:
@@ -69,6 +53,12 @@ def create_analysis_graph() -> StateGraph:
     The graph can loop between CRITIC and REFINER up to max_iterations times,
     then proceeds to FORMATTER to extract structured JSON before termination.
     
+    When exactly one refinement round is allowed, ANALYZER and CRITIC are
+    replaced by a single fused node that writes the report and then
+    self-checks it in one LLM call; a failed self-check gets the one
+    allowed REFINER pass:
+        START → COLLECTOR → COMBINED → [REFINER] → FORMATTER → END
+    
     Returns:
         Compiled StateGraph ready for execution
     """
@@ -76,31 +66,47 @@ def create_analysis_graph() -> StateGraph:
     
     # Initialize graph with state schema
     workflow = StateGraph(AnalysisState)
-    
-    # Add nodes (A, B, C, D, E)
     workflow.add_node("collector", collector_node)
-    workflow.add_node("analyzer", analyzer_node)
-    workflow.add_node("critic", critic_node)
-    workflow.add_node("refiner", refiner_node)
     workflow.add_node("formatter", formatter_node)  # Node E
-    
-    # Define edges
     workflow.set_entry_point("collector")
-    workflow.add_edge("collector", "analyzer")
-    workflow.add_edge("analyzer", "critic")
-    
-    # Conditional edge from critic
-    workflow.add_conditional_edges(
-        "critic",
-        should_continue_refinement,
-        {
-            "format": "formatter",  # Go to formatter when done
-            "refine": "refiner"
-        }
-    )
-    
-    # Loop back from refiner to critic
-    workflow.add_edge("refiner", "critic")
+    
+    if settings.max_refinement_iterations == 1:
+        # Fused path: one call replaces ANALYZER → CRITIC; the single
+        # refinement round needs no re-critique, so REFINER → FORMATTER
+        workflow.add_node("combined", combined_node)
+        workflow.add_node("refiner", refiner_node)
+        workflow.add_edge("collector", "combined")
+        workflow.add_conditional_edges(
+            "combined",
+            should_continue_refinement,
+            {
+                "format": "formatter",
+                "refine": "refiner"
+            }
+        )
+        workflow.add_edge("refiner", "formatter")
+    else:
+        # Add nodes (B, C, D)
+        workflow.add_node("analyzer", analyzer_node)
+        workflow.add_node("critic", critic_node)
+        workflow.add_node("refiner", refiner_node)
+        
+        # Define edges
+        workflow.add_edge("collector", "analyzer")
+        workflow.add_edge("analyzer", "critic")
+        
+        # Conditional edge from critic
+        workflow.add_conditional_edges(
+            "critic",
+            should_continue_refinement,
+            {
+                "format": "formatter",  # Go to formatter when done
+                "refine": "refiner"
+            }
+        )
+        
+        # Loop back from refiner to critic
+        workflow.add_edge("refiner", "critic")
     
     # Formatter is the final node before END
     workflow.add_edge("formatter", END)
@@ -112,13 +118,24 @@ def create_analysis_graph() -> StateGraph:
     return graph
 
 
+@functools.lru_cache(maxsize=1)
+def _get_graph():
+    """
+    Return the compiled workflow, building it on first use
+    
+    Nodes are stateless functions and all data flows through AnalysisState,
+    so a single compiled graph is safely shared across requests.
+    """
+    return create_analysis_graph()
+
+
 async def execute_analysis(sector: str, country: str = "India") -> AnalysisState:
     """
     Main entry point for executing the LangGraph analysis workflow (async)
     
-    This function initializes the state, creates the graph, and executes
-    the complete workflow from data collection through quality validation.
-    Uses ainvoke for async node support.
+    Identical (sector, country) requests arriving while a workflow is already
+    running await that workflow instead of starting a new one, so N concurrent
+    callers cost a single set of LLM and search calls.
     
     Args:
         sector: The sector to analyze
@@ -127,59 +144,61 @@ async def execute_analysis(sector: str, country: str = "India") -> AnalysisState
     Returns:
         Final state containing the markdown report and metadata
     """
+    key = (sector, country)
+    
+    # No await between lookup and insert, so this is atomic on the event loop
+    workflow = _inflight.get(key)
+    if workflow is None:
+        workflow = asyncio.ensure_future(_run_workflow(sector, country))
+        _inflight[key] = workflow
+        workflow.add_done_callback(lambda _: _inflight.pop(key, None))
+    else:
+        logger.info(f"[WORKFLOW] Joining in-flight analysis for sector: {sector}")
+    
+    # Shield so one caller disconnecting does not cancel the run for the others
+    return await asyncio.shield(workflow)
+
+
+async def _run_workflow(sector: str, country: str) -> AnalysisState:
+    """
+    Initialize the state, create the graph and execute the complete workflow
+    from data collection through quality validation. Uses ainvoke for async
+    node support.
+    """
     logger.info(f"[WORKFLOW] Starting analysis for sector: {sector}")
     
     # Initialize state with current timestamp
-    now_iso = datetime.utcnow().isoformat()
-    initial_state: AnalysisState = {
-        "sector": sector,
-        "country": country,
-        "raw_data": None,
-        "search_results": None,
-        "markdown_report": None,
-        "critique": None,
-        "iterations": 0,
-        "error": None,
-        "timestamp": now_iso,
-        "json_summary": None
-    }
-    
-    # Create and execute graph (async)
+    now_iso = iso_now()
+    initial_state = AnalysisState(sector=sector, country=country, timestamp=now_iso)
+    
+    # Latest state snapshot, kept so a timeout can return partial progress
+    latest = {}
+    
+    async def _drive() -> None:
+        async for values in _get_graph().astream(initial_state, stream_mode="values"):
+            latest.update(values if isinstance(values, dict) else asdict(values))
+    
+    # Execute the shared compiled graph (async) within the wall-clock budget
     try:
-        graph = create_analysis_graph()
-        final_state = await graph.ainvoke(initial_state)
+        await asyncio.wait_for(_drive(), timeout=settings.workflow_timeout_seconds)
+        final_state = AnalysisState(**latest)
         
         logger.info(
-            f"[WORKFLOW] ✓ Completed in {final_state['iterations']} refinement iterations"
+            f"[WORKFLOW] ✓ Completed in {final_state.iterations} refinement iterations"
         )
         return final_state
         
+    except asyncio.TimeoutError:
+        logger.error(f"[WORKFLOW] Timed out after {settings.workflow_timeout_seconds}s")
+        partial_state = AnalysisState(**latest) if latest else initial_state
+        partial_state.error = f"Workflow timed out after {settings.workflow_timeout_seconds}s"
+        # Keep a draft report if one was produced before the deadline
+        if not partial_state.markdown_report:
+            partial_state.markdown_report = render_error(sector, country, "timeout")
+        return partial_state
+        
     except Exception as e:
         logger.error(f"[WORKFLOW] Fatal error: {e}")
-        initial_state['error'] = f"Workflow execution failed: {str(e)}"
-        initial_state['markdown_report'] = _generate_error_report(sector, country, str(e))
+        initial_state.error = f"Workflow execution failed: {str(e)}"
+        initial_state.markdown_report = render_error(sector, country, str(e))
         return initial_state
-
-
-def _generate_error_report(sector: str, country: str, error: str) -> str:
-    """Generate error report when workflow fails"""
-    return f"""# {sector.title()} Sector - Trade Opportunities Analysis ({country})
-
-## Workflow Error
-
-The analysis workflow encountered a critical error and could not complete.
-
-**Error Details:**
-```
-{error}
-```
-
-## Recommended Actions
-
-1. Verify API configuration
-2. Check internet connection
-3. Review application logs
-4. Try again or contact support
-
-*Sector: {sector.title()} | Market: {country} | Status: Error*
-"""
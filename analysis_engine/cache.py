@@ -0,0 +1,101 @@
+"""
+LLM Response Cache Module
+Short-circuits repeated LLM node calls for the same sector and input
+"""
+from collections import OrderedDict
+from typing import Any, Optional
+import asyncio
+import hashlib
+import logging
+import time
+
+from diskcache import Cache
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class LLMResponseCache:
+    """
+    Two-tier TTL cache for LLM node responses
+    
+    Entries match on a hash of the normalized input rather than embedding
+    similarity: node inputs repeat verbatim across runs, so exact matching
+    gets the hits without an extra embeddings call per lookup.
+    
+    A bounded in-process LRU serves repeat requests without touching disk;
+    the disk tier survives restarts and backs LRU misses. Disk reads and
+    writes are SQLite calls, so they run in a worker thread to keep the
+    event loop free.
+    """
+    
+    def __init__(self, directory: str, ttl_seconds: int, enabled: bool = True, memory_size: int = 128):
+        """
+        Initialize the response cache
+        
+        Args:
+            directory: On-disk cache location (survives restarts)
+            ttl_seconds: Entry lifetime, bounds staleness of market data
+            enabled: Disable to bypass the cache entirely
+            memory_size: Maximum entries kept in the in-process LRU
+        """
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self.memory_size = memory_size
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (expires_at, value)
+        self._cache = Cache(directory) if enabled else None
+        logger.info(f"[CACHE] LLM cache {'enabled' if enabled else 'disabled'} (ttl: {ttl_seconds}s)")
+    
+    @staticmethod
+    def make_key(sector: str, country: str, node_type: str, payload: str) -> str:
+        """
+        Build cache key from (sector, country, node_type, hash(input))
+        
+        The payload is whitespace- and case-normalized so near-duplicate
+        inputs (re-wrapped text, trailing spaces) map to the same entry.
+        """
+        normalized = " ".join((payload or "").split()).lower()
+        digest = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+        return f"{node_type}|{sector.strip().lower()}|{country.strip().lower()}|{digest}"
+    
+    async def lookup(self, key: str) -> Optional[Any]:
+        """Return cached response or None on miss"""
+        if not self.enabled:
+            return None
+        
+        entry = self._memory.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._memory.move_to_end(key)
+                logger.info(f"[CACHE] Memory hit: {key.split('|', 1)[0]}")
+                return entry[1]
+            del self._memory[key]
+        
+        value = await asyncio.to_thread(self._cache.get, key)
+        if value is not None:
+            logger.info(f"[CACHE] Hit: {key.split('|', 1)[0]}")
+            self._remember(key, value)
+        return value
+    
+    async def store(self, key: str, value: Any) -> None:
+        """Store response with the configured TTL"""
+        if not self.enabled or value is None:
+            return
+        await asyncio.to_thread(self._cache.set, key, value, expire=self.ttl_seconds)
+        self._remember(key, value)
+    
+    def _remember(self, key: str, value: Any) -> None:
+        """Insert into the in-process LRU, evicting the least recently used entry"""
+        self._memory[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+
+# Global cache instance
+llm_cache = LLMResponseCache(
+    directory=settings.llm_cache_dir,
+    ttl_seconds=settings.llm_cache_ttl_seconds,
+    enabled=settings.llm_cache_enabled
+)
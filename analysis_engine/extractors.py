@@ -0,0 +1,66 @@
+"""
+Report Extractors Module
+Regex-based extraction of key metrics from generated markdown reports
+"""
+from typing import Any, Dict, List, Optional
+import re
+
+# Currency amount with a magnitude, e.g. "USD 400 billion", "$12.5B", "₹5.2 lakh crore"
+_AMOUNT = (
+    r'(?:USD|US\$|\$|INR|Rs\.?|₹)\s?\d[\d,]*(?:\.\d+)?\s*'
+    r'(?:trillion|billion|million|lakh crores?|crores?|tn|bn|[TBM])\b[^\n.;,(]*'
+)
+_MARKET_RE = re.compile(r'market size[^\n]*?(' + _AMOUNT + r')', re.I)
+_CAGR_RE = re.compile(r'(\d+(?:\.\d+)?\s?%\s*CAGR[^\n.;,(]*|CAGR[^\n]*?\d+(?:\.\d+)?\s?%)', re.I)
+# "## Actionable Recommendations", "### **Top Opportunities** (Next 12 Months)", ...
+_RECOMMENDATIONS_HEADER_RE = re.compile(
+    r'^(#{2,3})\s+(?:\*\*)?\s*(?:Actionable Recommendations|Top Opportunities)\b.*$', re.M | re.I
+)
+_HEADER_RE = re.compile(r'^(#{1,6})\s', re.M)
+_LIST_ITEM_RE = re.compile(r'^\s*(?:[-*]|\d+\.)\s+(\S.*)$', re.M)
+_EMPHASIS_RE = re.compile(r'[*_`]+')
+
+
+def extract_recommendations(report: str) -> List[str]:
+    """Return the list items under the recommendations section, in order"""
+    header = _RECOMMENDATIONS_HEADER_RE.search(report)
+    if not header:
+        return []
+    
+    # The section runs to the next header of the same or a higher level,
+    # so ### sub-headings inside a ## section stay part of it
+    level = len(header.group(1))
+    end = len(report)
+    for match in _HEADER_RE.finditer(report, header.end()):
+        if len(match.group(1)) <= level:
+            end = match.start()
+            break
+    
+    section = report[header.end():end]
+    return [_EMPHASIS_RE.sub('', item).strip() for item in _LIST_ITEM_RE.findall(section)]
+
+
+def extract_summary(report: str) -> Dict[str, Any]:
+    """
+    Extract market size, CAGR and top recommendations without an LLM call
+    
+    Args:
+        report: Markdown analysis report
+        
+    Returns:
+        Dict shaped like the formatter output; fields not found are None / []
+    """
+    market = _MARKET_RE.search(report)
+    cagr = _CAGR_RE.search(report)
+    
+    return {
+        'market_size': _clean(market.group(1)) if market else None,
+        'growth_cagr': _clean(cagr.group(1)) if cagr else None,
+        'top_recommendations': extract_recommendations(report)[:3]
+    }
+
+
+def _clean(text: str) -> Optional[str]:
+    """Strip markdown emphasis and trailing punctuation from a matched span"""
+    cleaned = _EMPHASIS_RE.sub('', text).strip(' :-()')
+    return cleaned or None
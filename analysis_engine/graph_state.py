@@ -2,15 +2,19 @@
 Graph State Module
 Defines the state schema for the LangGraph workflow
 """
-from typing import TypedDict, Optional, List, Dict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Union
 
 
-class AnalysisState(TypedDict):
+@dataclass(slots=True)
+class AnalysisState:
     """
     State object that flows through the LangGraph workflow
     
     This state is passed between nodes and tracks the entire analysis process.
-    Each node reads from and writes to this state.
+    Each node reads and updates its attributes and returns it. A slotted
+    dataclass gives attribute access and a compact per-invocation footprint;
+    LangGraph supports dataclass state schemas natively.
     
     Attributes:
         sector: The sector to analyze (e.g., "pharmaceuticals")
@@ -18,21 +22,27 @@ class AnalysisState(TypedDict):
         raw_data: Collected market data from web sources
         search_results: List of search results with metadata
         markdown_report: The generated markdown analysis report
-        critique: Feedback from the critic node (PASS or FAIL: reason)
+        critique: Feedback from the critic node ({'decision', 'reason'} or legacy string)
         iterations: Number of refinement cycles completed
         error: Any error message that occurred during processing
         timestamp: ISO timestamp when analysis started
         json_summary: Structured JSON summary extracted from final report
+        data_quality: Collected data quality (high, moderate, low)
+        fallback_used: Whether fallback context replaced search results
+        critique_history: Critique reasons already addressed by the refiner
+        next_node: Routing decision made by the critic ("format" or "refine")
     """
     sector: str
-    country: str
-    raw_data: Optional[str]
-    search_results: Optional[List[Dict[str, str]]]
-    markdown_report: Optional[str]
-    critique: Optional[str]
-    iterations: int
-    error: Optional[str]
-    timestamp: str
-    json_summary: Optional[Dict[str, any]]
-    data_quality: Optional[str]
-    fallback_used: Optional[bool]
+    country: str = "India"
+    raw_data: Optional[str] = None
+    search_results: Optional[List[Dict[str, Any]]] = None
+    markdown_report: Optional[str] = None
+    critique: Optional[Union[str, Dict[str, Any]]] = None
+    iterations: int = 0
+    error: Optional[str] = None
+    timestamp: str = ""
+    json_summary: Optional[Dict[str, Any]] = None
+    data_quality: Optional[str] = None
+    fallback_used: Optional[bool] = None
+    critique_history: Optional[List[str]] = None
+    next_node: Optional[str] = None
@@ -4,12 +4,14 @@ Node B in the LangGraph workflow - Generates initial analysis report
 """
 import logging
 from analysis_engine.graph_state import AnalysisState
+from analysis_engine.templates import render_fallback
+from analysis_engine.cache import llm_cache
 from external_tools.ai_client import openai_client
 
 logger = logging.getLogger(__name__)
 
 
-def analyzer_node(state: AnalysisState) -> AnalysisState:
+async def analyzer_node(state: AnalysisState) -> AnalysisState:
     """
     Node B: Generates initial market analysis using OpenAI GPT-4o
     
@@ -19,40 +21,33 @@ def analyzer_node(state: AnalysisState) -> AnalysisState:
     Returns:
         Updated state with markdown_report populated
     """
-    logger.info(f"[NODE B] Generating: {state['sector']}")
+    logger.info(f"[NODE B] Generating: {state.sector}")
     
     try:
-        # Generate analysis using AI client
-        report = openai_client.generate_analysis(
-            state['sector'],
-            state.get('country', 'India'),
-            state.get('raw_data', 'No data available')
-        )
+        country = state.country
+        raw_data = state.raw_data or 'No data available'
+        cache_key = llm_cache.make_key(state.sector, country, "analyzer", raw_data)
+        
+        # Serve repeated sector/data combinations from cache
+        report = await llm_cache.lookup(cache_key)
+        if report is None:
+            # Stream the analysis; API errors fall through to the fallback report below
+            chunks = await openai_client.generate_analysis(state.sector, country, raw_data, stream=True)
+            report = "".join([chunk async for chunk in chunks])
+            if report:
+                await llm_cache.store(cache_key, report)
         
         if report:
-            state['markdown_report'] = report
+            state.markdown_report = report
             logger.info(f"[NODE B] Generated {len(report)} chars")
         else:
-            state['error'] = "AI analysis returned empty response"
-            state['markdown_report'] = _generate_fallback_report(state['sector'], state.get('country', 'India'))
+            state.error = "AI analysis returned empty response"
+            state.markdown_report = render_fallback(state.sector, state.country)
             logger.warning("[NODE B] Using fallback")
             
     except Exception as e:
         logger.error(f"[NODE B] {e}")
-        state['error'] = f"AI analysis failed: {str(e)}"
-        state['markdown_report'] = _generate_fallback_report(state['sector'], state.get('country', 'India'))
+        state.error = f"AI analysis failed: {str(e)}"
+        state.markdown_report = render_fallback(state.sector, state.country)
     
     return state
-
-
-def _generate_fallback_report(sector: str, country: str) -> str:
-    """Generate fallback report when AI analysis fails"""
-    return f"""# {sector.title()} Sector - Trade Opportunities Analysis ({country})
-
-## Analysis Unavailable
-
-Technical difficulties prevented analysis generation. Please retry or verify OpenAI API configuration.
-
----
-*Sector: {sector.title()} | Market: {country} | Status: Service Issue*
-"""
@@ -2,12 +2,18 @@
 Data Collector Node
 Node A in the LangGraph workflow - Gathers market intelligence
 """
+import asyncio
 import logging
 from analysis_engine.graph_state import AnalysisState
-from external_tools.data_collector import data_collector
+from external_tools.ai_client import openai_client
+from external_tools.data_collector import get_data_collector
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Strong references to fire-and-forget tasks so they are not garbage collected
+_background_tasks = set()
+
 
 async def collector_node(state: AnalysisState) -> AnalysisState:
     """
@@ -22,24 +28,35 @@ async def collector_node(state: AnalysisState) -> AnalysisState:
     Returns:
         Updated state with raw_data and search_results populated
     """
-    logger.info(f"[NODE A] Starting: {state['sector']}")
+    logger.info(f"[NODE A] Starting: {state.sector}")
+    
+    # Warm the OpenAI connection while searches are in flight
+    warmup = asyncio.create_task(openai_client.warm_connection())
+    _background_tasks.add(warmup)
+    warmup.add_done_callback(_background_tasks.discard)
     
     try:
-        # Data collector performs I/O operations (HTTP requests with built-in delays)
-        data = data_collector.collect_sector_data(state['sector'], state.get('country', 'India'))
+        # Data collector performs I/O operations (concurrent, token-bucket paced queries)
+        data = await get_data_collector().collect_sector_data(state.sector, state.country)
         
         # Update state
-        state['raw_data'] = data['raw_data']
-        state['search_results'] = data['search_results']
-        state['data_quality'] = data.get('data_quality', 'unknown')
-        state['fallback_used'] = data.get('fallback_used', False)
+        # Plain guard: the collector formats at most 8 short snippets, so this
+        # only trims unexpected output (e.g. a provider returning full bodies)
+        raw_data = data['raw_data']
+        if len(raw_data) > settings.max_raw_data_chars:
+            logger.warning(f"[NODE A] Raw data is {len(raw_data)} chars, truncating to {settings.max_raw_data_chars}")
+            raw_data = raw_data[:settings.max_raw_data_chars]
+        state.raw_data = raw_data
+        state.search_results = data['search_results']
+        state.data_quality = data.get('data_quality', 'unknown')
+        state.fallback_used = data.get('fallback_used', False)
         
         logger.info(f"[NODE A] Collected {data['total_results']} results")
         
     except Exception as e:
         logger.error(f"[NODE A] {e}")
-        state['error'] = f"Data collection failed: {str(e)}"
-        state['raw_data'] = "Data collection encountered an error."
-        state['search_results'] = []
+        state.error = f"Data collection failed: {str(e)}"
+        state.raw_data = "Data collection encountered an error."
+        state.search_results = []
     
     return state
@@ -0,0 +1,62 @@
+"""
+Combined Analyzer Node
+Nodes B and C fused - Generates and self-checks a report in one LLM call
+"""
+import logging
+from analysis_engine.graph_state import AnalysisState
+from analysis_engine.cache import llm_cache
+from analysis_engine.nodes.analyzer_node import analyzer_node
+from external_tools.ai_client import openai_client
+
+logger = logging.getLogger(__name__)
+
+
+async def combined_node(state: AnalysisState) -> AnalysisState:
+    """
+    Nodes B+C: Generates a report and self-checks it in one call
+    
+    Used instead of analyzer -> critic when only one refinement round is
+    allowed. The critique is a post-hoc check of the returned report (it is
+    emitted after it); a FAIL routes the report to the refiner for the one
+    allowed revision. Falls back to the plain analyzer node if the fused
+    call fails.
+    
+    Args:
+        state: Current analysis state with raw_data
+    
+    Returns:
+        Updated state with markdown_report, critique and the routing
+        decision in next_node
+    """
+    logger.info(f"[NODE B+C] Generating with self-check: {state.sector}")
+    
+    try:
+        country = state.country
+        raw_data = state.raw_data or 'No data available'
+        cache_key = llm_cache.make_key(state.sector, country, "combined_checked", raw_data)
+        
+        result = await llm_cache.lookup(cache_key)
+        if result is None:
+            result = await openai_client.generate_and_refine(state.sector, country, raw_data)
+            if result:
+                await llm_cache.store(cache_key, result)
+        
+        if result:
+            critique = result['critique']
+            decision = str(critique.get('decision', 'PASS')).upper()
+            state.markdown_report = result['report']
+            state.critique = critique
+            # Fallback data can't support a stricter revision (mirrors the critic node)
+            state.next_node = "refine" if decision == 'FAIL' and not state.fallback_used else "format"
+            logger.info(f"[NODE B+C] Generated {len(result['report'])} chars (self-check: {decision})")
+            return state
+        
+        logger.warning("[NODE B+C] Fused call failed, falling back to analyzer")
+    
+    except Exception as e:
+        logger.error(f"[NODE B+C] {e}")
+    
+    # The plain analyzer has no verdict; send its report straight to the formatter
+    state = await analyzer_node(state)
+    state.next_node = "format"
+    return state
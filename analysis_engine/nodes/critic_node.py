@@ -3,29 +3,26 @@ Report Critic Node
 Node C in the LangGraph workflow - Validates report quality
 """
 import logging
+import re
 from analysis_engine.graph_state import AnalysisState
+from analysis_engine.cache import llm_cache
+from analysis_engine.extractors import extract_recommendations
 from external_tools.ai_client import openai_client
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Local pre-screen: well-formed drafts skip the LLM critic entirely
+_SECTION_RE = re.compile(r'^##\s', re.M)
+_METRIC_RE = re.compile(r'(CAGR|USD|INR|\$\s?\d|₹\s?\d)', re.I)
+_MIN_SECTIONS = 5
+_MIN_RECOMMENDATIONS = 3
 
-def clean_critique(critique_str: str) -> str:
-    """Remove markdown code block wrappers and clean whitespace"""
-    cleaned = critique_str.strip()
-    
-    # Remove markdown code blocks (```json, ```, etc.)
-    if cleaned.startswith("```"):
-        # Remove first line if it's a code block marker
-        lines = cleaned.split('\n', 1)
-        cleaned = lines[1] if len(lines) > 1 else cleaned
-    
-    if cleaned.endswith("```"):
-        cleaned = cleaned[:-3]
-    
-    return cleaned.strip()
+# Formatter fields returned alongside the critique
+_SUMMARY_FIELDS = ('market_size', 'growth_cagr', 'top_recommendations')
 
 
-def critic_node(state: AnalysisState) -> AnalysisState:
+async def critic_node(state: AnalysisState) -> AnalysisState:
     """
     Node C: Validates report quality and completeness
     
@@ -33,45 +30,99 @@ def critic_node(state: AnalysisState) -> AnalysisState:
         state: Current analysis state with markdown_report
         
     Returns:
-        Updated state with critique (PASS or FAIL: reason)
+        Updated state with critique (PASS or FAIL: reason) and the
+        routing decision in next_node
     """
-    logger.info(f"[NODE C] Reviewing (iter {state['iterations']})")
+    logger.info(f"[NODE C] Reviewing (iter {state.iterations})")
     
     try:
-        report = state.get('markdown_report', '')
+        report = state.markdown_report or ''
         
         # Basic validation
         if not report or len(report) < 500:
-            state['critique'] = "FAIL: Report is too short or empty. Needs substantial content."
+            state.critique = "FAIL: Report is too short or empty. Needs substantial content."
             logger.warning("[NODE C] Report too short")
-            return state
+            return _route(state, passed=False)
             
         # Skip strict critique if fallback data was used (prevent infinite loops on low data)
-        if state.get('fallback_used', False):
-            state['critique'] = "PASS"
+        if state.fallback_used:
+            state.critique = "PASS"
             logger.info("[NODE C] Fallback data used - skipping strict critique")
-            return state
+            return _route(state, passed=True)
+        
+        # Fast local heuristic: structured, quantified drafts pass without an LLM call
+        if _passes_heuristic(report):
+            state.critique = {"decision": "PASS", "reason": "heuristic"}
+            logger.info("[NODE C] ✓ Report PASSED local heuristic")
+            return _route(state, passed=True)
         
-        # Get AI critique (returns dict: {'decision': 'PASS'|'FAIL', 'reason': '...'})
-        critique_dict = openai_client.critique_report(state['sector'], report)
+        # Get AI critique plus formatter fields in one call
+        # (returns dict: {'decision': 'PASS'|'FAIL', 'reason': '...', <summary fields>})
+        cache_key = llm_cache.make_key(state.sector, state.country, "evaluate", report)
+        result = await llm_cache.lookup(cache_key)
+        if result is None:
+            result = await openai_client.evaluate_and_extract(state.sector, report)
+            # Fail-safe defaults are not real verdicts, never cache them
+            if not result.get('fallback'):
+                await llm_cache.store(cache_key, result)
         
         # Parse the structured dictionary for reliable decision-making
-        decision = critique_dict.get('decision', 'PASS').upper()
-        reason = critique_dict.get('reason', 'No reason provided')
+        decision = result.get('decision', 'PASS').upper()
+        reason = result.get('reason', 'No reason provided')
         
-        # Store the full critique dict in state
-        state['critique'] = critique_dict
+        # Store the critique part in state
+        state.critique = {key: result[key] for key in ('decision', 'reason', 'fallback') if key in result}
         
         # Log with clear visual indicators
         if decision == "PASS":
             logger.info("[NODE C] ✓ Report PASSED review")
+            # The report is final: hand the extracted fields to the formatter
+            summary = {key: result.get(key) for key in _SUMMARY_FIELDS}
+            if any(summary.values()):
+                summary['top_recommendations'] = summary['top_recommendations'] or []
+                state.json_summary = summary
         else:
             # Truncate reason for logging clarity
             logger.info(f"[NODE C] ✗ Needs work: {reason[:80]}...")
+        
+        return _route(state, passed=decision == "PASS")
             
     except Exception as e:
         logger.error(f"[NODE C] Exception during critique: {e}")
         # Default to PASS dictionary on error to avoid blocking
-        state['critique'] = {"decision": "PASS", "reason": "Internal node error - defaulted to PASS."}
+        state.critique = {"decision": "PASS", "reason": "Internal node error - defaulted to PASS."}
     
+    return _route(state, passed=True)
+
+
+def _route(state: AnalysisState, passed: bool) -> AnalysisState:
+    """
+    Record the next hop so the conditional edge needs no re-parsing
+    
+    Passed reports, and any report once max iterations are reached,
+    go to the formatter; everything else goes back to the refiner.
+    """
+    if passed:
+        logger.info("[DECISION] Report passed review, proceeding to FORMATTER")
+        state.next_node = "format"
+    elif state.iterations >= settings.max_refinement_iterations:
+        logger.info(f"[DECISION] Max iterations reached ({state.iterations}), proceeding to FORMATTER")
+        state.next_node = "format"
+    else:
+        logger.info(f"[DECISION] Report needs refinement (iteration {state.iterations + 1})")
+        state.next_node = "refine"
     return state
+
+
+def _passes_heuristic(report: str) -> bool:
+    """
+    Check structure and specificity without an LLM roundtrip
+    
+    Requires the main report sections, at least one quantified market
+    figure, and a populated recommendations list.
+    """
+    if len(_SECTION_RE.findall(report)) < _MIN_SECTIONS:
+        return False
+    if not _METRIC_RE.search(report):
+        return False
+    return len(extract_recommendations(report)) >= _MIN_RECOMMENDATIONS
@@ -4,16 +4,19 @@ Extracts structured data from the final validated markdown report
 """
 import logging
 from analysis_engine.graph_state import AnalysisState
+from analysis_engine.cache import llm_cache
+from analysis_engine.extractors import extract_summary
 from external_tools.ai_client import openai_client
 
 logger = logging.getLogger(__name__)
 
 
-def formatter_node(state: AnalysisState) -> AnalysisState:
+async def formatter_node(state: AnalysisState) -> AnalysisState:
     """
     Node E: Extracts structured data from validated markdown report
     
-    Uses GPT-4o-mini to extract key metrics into JSON format.
+    Parses key metrics straight from the markdown; GPT-4o-mini is only
+    used when the report does not expose every field in the expected form.
     
     Args:
         state: Current analysis state with validated markdown_report
@@ -21,13 +24,33 @@ def formatter_node(state: AnalysisState) -> AnalysisState:
     Returns:
         Updated state with json_summary field populated
     """
-    logger.info(f"[NODE E] Extracting: {state['sector']}")
+    logger.info(f"[NODE E] Extracting: {state.sector}")
     
     try:
-        # Extract structured data using AI
-        json_summary = openai_client.format_report(state.get('markdown_report', ''), state['sector'])
+        # The critic already extracted the summary alongside its PASS verdict
+        if state.json_summary:
+            logger.info("[NODE E] Using summary extracted during review")
+            return state
         
-        state['json_summary'] = json_summary
+        report = state.markdown_report or ''
+        
+        # Well-formed reports need no extraction call
+        json_summary = extract_summary(report)
+        if all(json_summary.values()):
+            state.json_summary = json_summary
+            logger.info(f"[NODE E] Parsed {len(json_summary['top_recommendations'])} items locally")
+            return state
+        
+        cache_key = llm_cache.make_key(state.sector, state.country, "formatter", report)
+        
+        json_summary = await llm_cache.lookup(cache_key)
+        if json_summary is None:
+            # Extract structured data using AI
+            json_summary = await openai_client.format_report(report, state.sector)
+            if any(json_summary.get(field) for field in ('market_size', 'growth_cagr', 'top_recommendations')):
+                await llm_cache.store(cache_key, json_summary)
+        
+        state.json_summary = json_summary
         logger.info(f"[NODE E] Extracted {len(json_summary.get('top_recommendations', []))} items")
         
         return state
@@ -36,7 +59,7 @@ def formatter_node(state: AnalysisState) -> AnalysisState:
         logger.error(f"[NODE E] {e}")
         
         # Fallback: Set minimal structure
-        state['json_summary'] = {
+        state.json_summary = {
             'market_size': None,
             'growth_cagr': None,
             'top_recommendations': []
@@ -4,12 +4,14 @@ Node D in the LangGraph workflow - Improves report based on feedback
 """
 import logging
 from analysis_engine.graph_state import AnalysisState
+from analysis_engine.cache import llm_cache
 from external_tools.ai_client import openai_client
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
 
-def refiner_node(state: AnalysisState) -> AnalysisState:
+async def refiner_node(state: AnalysisState) -> AnalysisState:
     """
     Node D: Refines report based on critic feedback
     
@@ -23,20 +25,42 @@ def refiner_node(state: AnalysisState) -> AnalysisState:
     
     try:
         # Extract critique reason from dict or use raw string
-        critique = state.get('critique', {})
+        critique = state.critique or {}
         critique_text = critique.get('reason', str(critique)) if isinstance(critique, dict) else str(critique)
         
-        # Generate refined version using AI client
-        refined_report = openai_client.refine_report(
-            state['sector'],
-            state.get('country', 'India'),
-            state.get('markdown_report', ''),
-            critique_text,
-            state.get('raw_data', '')
+        # A critique that repeats the previous one means refinement has stalled
+        history = state.critique_history or []
+        state.critique_history = history + [critique_text]
+        if history and await _is_repeat_critique(history[-1], critique_text):
+            logger.info("[NODE D] Critique unchanged since last round - stopping refinement")
+            # finally bumps this to the cap, so the next critic pass routes to the formatter
+            state.iterations = settings.max_refinement_iterations - 1
+            return state
+        
+        country = state.country
+        original_report = state.markdown_report or ''
+        cache_key = llm_cache.make_key(
+            state.sector, country, "refiner", f"{original_report}|{critique_text}"
         )
         
+        refined_report = await llm_cache.lookup(cache_key)
+        if refined_report is None:
+            # Stream the refined version; API errors fall through to the except below
+            chunks = await openai_client.refine_report(
+                state.sector,
+                country,
+                original_report,
+                critique_text,
+                state.raw_data or '',
+                stream=True
+            )
+            refined_report = "".join([chunk async for chunk in chunks])
+            # refine_report echoes the original on failure - only cache real revisions
+            if refined_report and refined_report != original_report:
+                await llm_cache.store(cache_key, refined_report)
+        
         if refined_report:
-            state['markdown_report'] = refined_report
+            state.markdown_report = refined_report
             logger.info("[NODE D] Refined")
         else:
             logger.warning("[NODE D] Failed, keeping original")
@@ -45,6 +69,25 @@ def refiner_node(state: AnalysisState) -> AnalysisState:
         logger.error(f"[NODE D] {e}")
     finally:
         # Always increment iteration counter exactly once
-        state['iterations'] = state.get('iterations', 0) + 1
+        state.iterations = state.iterations + 1
     
     return state
+
+
+async def _is_repeat_critique(previous: str, current: str) -> bool:
+    """
+    Compare consecutive critique reasons by embedding cosine similarity
+    
+    Both reasons are embedded in a single batched request. OpenAI embeddings
+    are unit-length, so the dot product is the cosine similarity.
+    """
+    if previous == current:
+        return True
+    
+    vectors = await openai_client.embed_texts([previous, current])
+    if not vectors or len(vectors) != 2:
+        return False
+    
+    similarity = sum(a * b for a, b in zip(*vectors))
+    logger.info(f"[NODE D] Critique similarity to previous round: {similarity:.3f}")
+    return similarity > settings.critique_similarity_threshold
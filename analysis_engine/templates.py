@@ -0,0 +1,48 @@
+"""
+Report Templates Module
+Shared markdown templates for error and fallback reports
+"""
+from string import Template
+
+# Workflow-level failure (graph execution raised)
+ERROR_TPL = Template("""# $sector Sector - Trade Opportunities Analysis ($country)
+
+## Workflow Error
+
+The analysis workflow encountered a critical error and could not complete.
+
+**Error Details:**
+```
+$error
+```
+
+## Recommended Actions
+
+1. Verify API configuration
+2. Check internet connection
+3. Review application logs
+4. Try again or contact support
+
+*Sector: $sector | Market: $country | Status: Error*
+""")
+
+# Node-level failure (AI analysis unavailable)
+FALLBACK_TPL = Template("""# $sector Sector - Trade Opportunities Analysis ($country)
+
+## Analysis Unavailable
+
+Technical difficulties prevented analysis generation. Please retry or verify OpenAI API configuration.
+
+---
+*Sector: $sector | Market: $country | Status: Service Issue*
+""")
+
+
+def render_error(sector: str, country: str, error: str) -> str:
+    """Render the report returned when the workflow fails"""
+    return ERROR_TPL.substitute(sector=sector.title(), country=country, error=error)
+
+
+def render_fallback(sector: str, country: str) -> str:
+    """Render the report used when AI analysis fails"""
+    return FALLBACK_TPL.substitute(sector=sector.title(), country=country)
@@ -2,22 +2,32 @@
 API Endpoints Module
 Defines all FastAPI routes for the Trade Opportunities API
 """
-from fastapi import APIRouter, HTTPException, status, Depends
-from fastapi.responses import PlainTextResponse
-from datetime import datetime
+from fastapi import APIRouter, HTTPException, Query, status, Depends
+from fastapi.responses import ORJSONResponse, PlainTextResponse
+from datetime import datetime, timezone
+from typing import List
 import logging
 import uuid
 
-from app.models import StructuredAnalysisResponse, DataSummary, User, Source
+from app.models import (
+    StructuredAnalysisResponse, DataSummary, User, Source,
+    SectorSources, MultiSectorSourcesResponse
+)
 from app.core.auth import get_current_user
+from app.core.clock import iso_now
 from app.services.in_memory_store import rate_limiter
+from app.services.redis_cache import analysis_cache
 from analysis_engine.analysis_graph import execute_analysis
+from external_tools.data_collector import DataCollector, get_data_collector
 
 logger = logging.getLogger(__name__)
 
 # Create API router
 router = APIRouter()
 
+# Upper bound on sectors fanned out by a single /v1/sources request
+MAX_SECTORS_PER_REQUEST = 5
+
 
 @router.get("/", tags=["Root"])
 async def root():
@@ -30,6 +40,7 @@ async def root():
         "endpoints": {
             "analysis": "/v1/analyze/{sector}",
             "download": "/v1/analyze/{sector}/download",
+            "sources": "/v1/sources?sectors={sector}&sectors={sector}",
             "rate_limits": "/v1/rate-limits",
             "health": "/health"
         }
@@ -41,7 +52,7 @@ async def health_check():
     """Health check endpoint"""
     return {
         "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": iso_now(),
         "service": "Trade Opportunities API",
         "version": "1.0.0"
     }
@@ -50,6 +61,7 @@ async def health_check():
 @router.get(
     "/v1/analyze/{sector}",
     response_model=StructuredAnalysisResponse,
+    response_class=ORJSONResponse,
     tags=["Analysis"],
     responses={
         400: {"description": "Invalid sector parameter"},
@@ -90,10 +102,24 @@ async def analyze_sector(
     sector = sector.strip().lower()
     user_id = current_user.username
     
-    # Check rate limits
+    await _enforce_rate_limit(user_id)
+    return await _analyze(sector, user_id)
+
+
+async def _enforce_rate_limit(user_id: str) -> None:
+    """Raise 429 when the user is over their rate limit"""
     allowed, message = await rate_limiter.check_rate_limit(user_id)
     if not allowed:
         raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=message)
+
+
+async def _analyze(sector: str, user_id: str) -> StructuredAnalysisResponse:
+    """Serve a normalized sector's analysis from cache or run the workflow (rate limit already applied)"""
+    # Serve from shared cache when this sector was analyzed recently
+    cached = await analysis_cache.get(sector, "India")
+    if cached:
+        logger.info(f"⚡ [API] Serving cached analysis for: {sector} (user: {user_id})")
+        return cached
     
     logger.info(f"🚀 [API] Starting LangGraph workflow for: {sector} (user: {user_id})")
     
@@ -102,9 +128,10 @@ async def analyze_sector(
         final_state = await execute_analysis(sector, "India")
         
         # Extract results
-        analysis_report = final_state.get('markdown_report', '')
-        iterations = final_state.get('iterations', 0)
-        error = final_state.get('error')
+        analysis_report = final_state.markdown_report or ''
+        iterations = final_state.iterations
+        error = final_state.error
+        degraded = bool(error or final_state.fallback_used)
         
         # Log completion
         remaining = rate_limiter.get_remaining_requests(user_id)
@@ -114,7 +141,7 @@ async def analyze_sector(
             logger.info(f"✅ [API] {sector} completed (iter: {iterations}). Remaining: {remaining['per_minute']}/min")
         
         # Extract structured data summary
-        json_summary = final_state.get('json_summary', {})
+        json_summary = final_state.json_summary or {}
         data_summary = DataSummary(
             market_size=json_summary.get('market_size'),
             growth_cagr=json_summary.get('growth_cagr'),
@@ -129,20 +156,27 @@ async def analyze_sector(
                 source=result.get('source', ''),
                 snippet=result.get('snippet', '')
             )
-            for result in final_state.get('search_results', [])[:10]
+            for result in (final_state.search_results or [])[:10]
         ]
         
         # Return structured JSON with embedded markdown
-        return StructuredAnalysisResponse(
-            status="success",
+        response = StructuredAnalysisResponse(
+            # "partial" tells clients the run degraded and should not be reused
+            status="partial" if degraded else "success",
             report_id=str(uuid.uuid4()),
             sector=sector,
-            timestamp=final_state.get('timestamp', datetime.utcnow().isoformat()),
+            timestamp=final_state.timestamp or iso_now(),
             data_summary=data_summary,
             markdown_body=analysis_report,
             sources=sources
         )
         
+        # Only cache clean runs so transient failures are retried
+        if not degraded:
+            await analysis_cache.set(sector, "India", response)
+        
+        return response
+        
     except HTTPException:
         raise
     except Exception as e:
@@ -165,15 +199,75 @@ async def download_analysis(
     """
     Download sector analysis as a markdown file
     
-    Note: This runs a full analysis. For production, consider caching results
-    or requiring clients to POST the report they want to download.
+    Serves the cached analysis when one exists (e.g. right after calling
+    /v1/analyze/{sector}); otherwise runs a full analysis.
     """
-    analysis_response = await analyze_sector(sector, current_user)
+    # Cache hits count against the limit too, as on /v1/analyze/{sector}
+    await _enforce_rate_limit(current_user.username)
+    analysis_response = await _analyze(sector.strip().lower(), current_user.username)
     
     return PlainTextResponse(
         content=analysis_response.markdown_body,
         media_type="text/markdown",
-        headers={"Content-Disposition": f"attachment; filename={sector}_analysis_{datetime.utcnow().strftime('%Y%m%d')}.md"}
+        headers={"Content-Disposition": f"attachment; filename={sector}_analysis_{datetime.now(timezone.utc).strftime('%Y%m%d')}.md"}
+    )
+
+
+@router.get(
+    "/v1/sources",
+    response_model=MultiSectorSourcesResponse,
+    response_class=ORJSONResponse,
+    tags=["Analysis"],
+    responses={
+        400: {"description": "Invalid sectors parameter"},
+        429: {"description": "Rate limit exceeded"}
+    }
+)
+async def collect_sources(
+    sectors: List[str] = Query(..., description="Sectors to research (repeat the parameter)"),
+    current_user: User = Depends(get_current_user),
+    data_collector: DataCollector = Depends(get_data_collector)
+) -> MultiSectorSourcesResponse:
+    """
+    Collect ranked news sources for several sectors in one call
+    
+    Sectors are searched concurrently, so latency stays close to that of a
+    single sector. Counts as one request against the rate limit.
+    """
+    # Normalize and drop duplicates, keeping request order
+    sectors = list(dict.fromkeys(s.strip().lower() for s in sectors if s.strip()))
+    if not sectors or len(sectors) > MAX_SECTORS_PER_REQUEST:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Provide between 1 and {MAX_SECTORS_PER_REQUEST} sectors"
+        )
+    
+    allowed, message = await rate_limiter.check_rate_limit(current_user.username)
+    if not allowed:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=message)
+    
+    collected = await data_collector.collect_many(sectors, "India")
+    
+    return MultiSectorSourcesResponse(
+        country="India",
+        sectors=[
+            SectorSources(
+                sector=sector,
+                timestamp=data['timestamp'],
+                data_quality=data['data_quality'],
+                fallback_used=data['fallback_used'],
+                sources=[
+                    Source(
+                        title=result.get('title', ''),
+                        url=result.get('url', ''),
+                        source=result.get('source', ''),
+                        snippet=result.get('snippet', '')
+                    )
+                    for result in data['search_results']
+                ]
+            )
+            for sector, data in zip(sectors, collected)
+        ]
     )
 
 
@@ -199,7 +293,7 @@ async def get_rate_limits(current_user: User = Depends(get_current_user)):
             "per_hour": settings.rate_limit_per_hour
         },
         "remaining": remaining,
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": iso_now()
     }
 
 
@@ -0,0 +1,43 @@
+"""
+Clock Module
+Cached UTC timestamps at one-second resolution and dates at one-day resolution
+"""
+from datetime import datetime, timezone
+from typing import Tuple
+import time
+
+# [epoch second, ISO string] of the last formatted timestamp
+_last_ts = [0, '']
+
+# (UTC day number, long date string, year) of the last formatted date
+_last_day = (-1, '', 0)
+
+
+def iso_now() -> str:
+    """
+    Current UTC time as an ISO 8601 string, re-formatted at most once per second
+    
+    Returns:
+        Timestamp such as '2024-05-01T12:00:00+00:00'
+    """
+    now = int(time.time())
+    if now != _last_ts[0]:
+        # Build the new pair first so readers never see a mismatched second
+        _last_ts[:] = [now, datetime.fromtimestamp(now, timezone.utc).isoformat()]
+    return _last_ts[1]
+
+
+def today() -> Tuple[str, int]:
+    """
+    Current UTC date as a long string plus the year, re-formatted once per day
+    
+    Returns:
+        Tuple such as ('May 01, 2024', 2024)
+    """
+    global _last_day
+    now = time.time()
+    day = int(now // 86400)
+    if day != _last_day[0]:
+        date = datetime.fromtimestamp(now, timezone.utc)
+        _last_day = (day, date.strftime('%B %d, %Y'), date.year)
+    return _last_day[1], _last_day[2]
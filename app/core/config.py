@@ -12,6 +12,9 @@ class Settings(BaseSettings):
     openai_api_key: str
     gnews_api_key: str = ""  # Optional: GNews API for news search (free tier available)
     
+    # Search
+    use_google_news_rss: bool = True  # Keyless Google News RSS as primary search; False uses DuckDuckGo only
+    
     # Rate Limiting
     rate_limit_per_minute: int = 5
     rate_limit_per_hour: int = 30
@@ -19,10 +22,31 @@ class Settings(BaseSettings):
     # Server
     host: str = "0.0.0.0"
     port: int = 8000
+    reload: bool = False  # Dev auto-reload (single process, default asyncio loop)
+    workers: int = 1  # >1 splits the in-memory API key and rate-limit stores per process
+    timeout_keep_alive: int = 75  # Seconds idle client connections stay open
     
     # Analysis Settings
     default_country: str = "India"
     max_refinement_iterations: int = 1
+    workflow_timeout_seconds: int = 90  # Hard wall-clock budget per analysis
+    critic_model: str = "gpt-4o-mini"  # Bounded PASS/FAIL judgment, no need for gpt-4o
+    formatter_model: str = "gpt-4o-mini"  # Structured extraction from the final report
+    max_raw_data_chars: int = 8_000  # Guard on collected data: top 8 articles x ~300-char snippet + headers
+    critique_similarity_threshold: float = 0.95  # Stop refining when critiques stop changing
+    
+    # Search Result Cache
+    search_cache_ttl_seconds: int = 1800  # Reuse collected sector data for 30 min
+    article_memo_ttl_seconds: int = 86400  # Reuse cleaned/scored articles across sectors for 24 h
+    
+    # LLM Response Cache
+    llm_cache_enabled: bool = True
+    llm_cache_dir: str = ".llm_cache"
+    llm_cache_ttl_seconds: int = 86400  # 24h keeps market data reasonably fresh
+    
+    # Analysis Response Cache
+    redis_url: str = ""  # Optional: e.g. redis://localhost:6379/0 (empty disables)
+    cache_ttl_seconds: int = 3600
     
     class Config:
         env_file = ".env"
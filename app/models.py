@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 
 
@@ -10,6 +10,8 @@ class User(BaseModel):
 
 class Source(BaseModel):
     """Source citation with metadata"""
+    model_config = ConfigDict(frozen=True)
+    
     title: str
     url: str
     source: str
@@ -23,9 +25,25 @@ class DataSummary(BaseModel):
     top_recommendations: list[str] = []
 
 
+class SectorSources(BaseModel):
+    """Collected sources for one sector"""
+    sector: str
+    timestamp: str
+    data_quality: str
+    fallback_used: bool = False
+    sources: list[Source] = []
+
+
+class MultiSectorSourcesResponse(BaseModel):
+    """Sources collected for several sectors in one request"""
+    status: str = "success"
+    country: str
+    sectors: list[SectorSources] = []
+
+
 class StructuredAnalysisResponse(BaseModel):
     """Structured API response with JSON summary and full markdown report"""
-    status: str = "success"
+    status: str = "success"  # "partial" when the workflow hit errors or fell back
     report_id: str
     sector: str
     timestamp: str
@@ -2,113 +2,198 @@
 In-Memory Store Module
 Provides in-memory storage for API keys and rate limiting
 """
-from collections import defaultdict, deque
-from datetime import datetime, timedelta
-from typing import Dict, Deque, Tuple, Optional
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Optional, Set, Tuple
 import asyncio
+import hashlib
+import logging
 import secrets
+import time
+
+logger = logging.getLogger(__name__)
 
 
 class APIKeyStore:
-    """In-memory storage for API keys"""
+    """
+    In-memory storage for API keys
+    
+    Keys are indexed by their SHA-256 digest, so plaintext keys are never
+    held in the store. Lookups stay O(1), and the timing of a dict probe on
+    a digest reveals nothing useful about the plaintext key.
+    """
     
     def __init__(self):
-        # Store: {api_key: user_id}
-        self.keys: Dict[str, str] = {}
+        # Store: {sha256(api_key): user_id}
+        self.keys: Dict[bytes, str] = {}
+        
+        # Inverse index for generated keys: {user_id: {sha256(api_key), ...}}
+        self.by_user: Dict[str, Set[bytes]] = {}
         
         # Pre-populate with demo keys
-        self.keys["demo-key-12345"] = "demo"
-        self.keys["guest-key-67890"] = "guest"
-        self.keys["test-key-abcde"] = "test"
+        self.keys[self._hash("demo-key-12345")] = "demo"
+        self.keys[self._hash("guest-key-67890")] = "guest"
+        self.keys[self._hash("test-key-abcde")] = "test"
+    
+    @staticmethod
+    def _hash(api_key: str) -> bytes:
+        """Digest used as the store index for an API key"""
+        return hashlib.sha256(api_key.encode("utf-8")).digest()
     
     def generate_key(self, user_id: str) -> str:
-        """Generate a new API key for a user"""
-        api_key = f"{user_id}-{secrets.token_urlsafe(16)}"
-        self.keys[api_key] = user_id
+        """Generate a new API key for a user (plaintext is returned only once)"""
+        # Opaque random token: the owner lives in the value, not in the key text
+        api_key = secrets.token_urlsafe(24)
+        key_hash = self._hash(api_key)
+        self.keys[key_hash] = user_id
+        self.by_user.setdefault(user_id, set()).add(key_hash)
         return api_key
     
     def verify_key(self, api_key: str) -> Optional[str]:
         """Verify API key and return user_id"""
-        return self.keys.get(api_key)
+        return self.keys.get(self._hash(api_key))
     
     def revoke_key(self, api_key: str) -> bool:
         """Revoke an API key"""
-        if api_key in self.keys:
-            del self.keys[api_key]
-            return True
-        return False
+        key_hash = self._hash(api_key)
+        user_id = self.keys.pop(key_hash, None)
+        if user_id is None:
+            return False
+        
+        user_keys = self.by_user.get(user_id)
+        if user_keys is not None:
+            user_keys.discard(key_hash)
+            if not user_keys:
+                del self.by_user[user_id]
+        return True
 
 
 class RateLimiter:
-    """In-memory rate limiter with per-user tracking"""
+    """
+    In-memory rate limiter with per-user tracking
+    
+    Concurrency: check_rate_limit never awaits between reading and updating
+    a user's window, so on the single-threaded event loop each check runs to
+    completion without interleaving. No lock is needed, and checks for
+    different users never wait on each other.
+    """
     
     def __init__(self, requests_per_minute: int = 5, requests_per_hour: int = 30):
         self.requests_per_minute = requests_per_minute
         self.requests_per_hour = requests_per_hour
         
-        # Store timestamps of requests per user
-        self.minute_requests: Dict[str, Deque[datetime]] = defaultdict(lambda: deque())
-        self.hour_requests: Dict[str, Deque[datetime]] = defaultdict(lambda: deque())
-        
-        # Lock for thread safety
-        self._lock = asyncio.Lock()
+        # Monotonic request timestamps per user, packed as contiguous doubles.
+        # Appends are non-decreasing, so each array is sorted and window
+        # boundaries are found by bisection; entries before hour_head are
+        # expired and get compacted away once they make up half the array
+        self.request_times: Dict[str, array] = defaultdict(lambda: array('d'))
+        self.hour_head: Dict[str, int] = defaultdict(int)
     
     async def check_rate_limit(self, user_id: str) -> Tuple[bool, str]:
         """
         Check if user has exceeded rate limits
         
+        Callers must authenticate first and pass only verified user ids
+        (API key owners or "guest"). Every call may allocate per-user state,
+        so unverified ids, e.g. bots cycling random keys, must never reach here.
+        The get_current_user dependency rejects invalid keys with 401 before
+        the endpoint body runs.
+        
         Args:
-            user_id: User identifier
+            user_id: Verified user identifier
             
         Returns:
             (allowed, message) tuple
         """
-        async with self._lock:
-            now = datetime.utcnow()
-            
-            # Clean old entries
-            self._clean_old_entries(user_id, now)
-            
-            # Check minute limit
-            if len(self.minute_requests[user_id]) >= self.requests_per_minute:
-                oldest = self.minute_requests[user_id][0]
-                wait_time = 60 - (now - oldest).total_seconds()
-                return False, f"Rate limit exceeded. Try again in {int(wait_time)} seconds."
-            
-            # Check hour limit
-            if len(self.hour_requests[user_id]) >= self.requests_per_hour:
-                oldest = self.hour_requests[user_id][0]
-                wait_time = 3600 - (now - oldest).total_seconds()
-                return False, f"Hourly rate limit exceeded. Try again in {int(wait_time / 60)} minutes."
-            
-            # Record request
-            self.minute_requests[user_id].append(now)
-            self.hour_requests[user_id].append(now)
-            
-            return True, "OK"
+        # Keep this body free of awaits: it relies on running without interleaving
+        now = time.monotonic()
+        
+        # Clean old entries
+        head = self._clean_old_entries(user_id, now)
+        times = self.request_times[user_id]
+        minute_start = bisect_left(times, now - 60.0, head)
+        
+        # Check minute limit
+        if len(times) - minute_start >= self.requests_per_minute:
+            oldest = times[minute_start]
+            wait_time = 60.0 - (now - oldest)
+            return False, f"Rate limit exceeded. Try again in {int(wait_time)} seconds."
+        
+        # Check hour limit
+        if len(times) - head >= self.requests_per_hour:
+            oldest = times[head]
+            wait_time = 3600.0 - (now - oldest)
+            return False, f"Hourly rate limit exceeded. Try again in {int(wait_time / 60)} minutes."
+        
+        # Record request
+        times.append(now)
+        
+        return True, "OK"
     
-    def _clean_old_entries(self, user_id: str, now: datetime):
-        """Remove entries older than the time window"""
-        minute_ago = now - timedelta(minutes=1)
-        hour_ago = now - timedelta(hours=1)
-        
-        # Clean minute window
-        while self.minute_requests[user_id] and self.minute_requests[user_id][0] < minute_ago:
-            self.minute_requests[user_id].popleft()
-        
-        # Clean hour window
-        while self.hour_requests[user_id] and self.hour_requests[user_id][0] < hour_ago:
-            self.hour_requests[user_id].popleft()
+    def _clean_old_entries(self, user_id: str, now: float) -> int:
+        """
+        Advance the hour window start past expired entries
+        
+        Returns:
+            Index of the first entry within the last hour
+        """
+        times = self.request_times[user_id]
+        head = bisect_left(times, now - 3600.0, self.hour_head[user_id])
+        
+        # Compact once expired entries dominate, keeping memory bounded
+        if head > len(times) // 2:
+            del times[:head]
+            head = 0
+        
+        self.hour_head[user_id] = head
+        return head
     
     def get_remaining_requests(self, user_id: str) -> Dict[str, int]:
         """Get remaining requests for user"""
-        now = datetime.utcnow()
-        self._clean_old_entries(user_id, now)
+        if user_id not in self.request_times:
+            # Unknown or reaped user: don't materialize an entry just to report
+            return {"per_minute": self.requests_per_minute, "per_hour": self.requests_per_hour}
+        
+        now = time.monotonic()
+        head = self._clean_old_entries(user_id, now)
+        times = self.request_times[user_id]
         
         return {
-            "per_minute": self.requests_per_minute - len(self.minute_requests[user_id]),
-            "per_hour": self.requests_per_hour - len(self.hour_requests[user_id])
+            "per_minute": self.requests_per_minute - (len(times) - bisect_left(times, now - 60.0, head)),
+            "per_hour": self.requests_per_hour - (len(times) - head)
         }
+    
+    @property
+    def tracked_users(self) -> int:
+        """Number of users currently holding rate-limit state"""
+        return len(self.request_times)
+    
+    def reap_idle_users(self) -> int:
+        """
+        Drop users whose request windows have fully expired
+        
+        Returns:
+            Number of users removed
+        """
+        now = time.monotonic()
+        reaped = 0
+        
+        # Snapshot the keys: entries are deleted while iterating
+        for user_id in list(self.request_times):
+            if self._clean_old_entries(user_id, now) == len(self.request_times[user_id]):
+                del self.request_times[user_id]
+                self.hour_head.pop(user_id, None)
+                reaped += 1
+        return reaped
+    
+    async def run_reaper(self, interval_seconds: float = 60.0) -> None:
+        """Periodically reap idle users so per-user state stays bounded"""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            reaped = self.reap_idle_users()
+            if reaped:
+                logger.info(f"[RATE LIMIT] Reaped {reaped} idle users ({self.tracked_users} tracked)")
 
 
 # Global instances
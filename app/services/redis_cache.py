@@ -0,0 +1,82 @@
+"""
+Redis Cache Module
+Shares completed sector analyses across workers so repeat queries and
+downloads are served without re-running the workflow
+"""
+from datetime import datetime, timezone
+from typing import Optional
+import logging
+
+import redis.asyncio as redis
+
+from app.core.config import settings
+from app.models import StructuredAnalysisResponse
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisCache:
+    """Redis-backed cache of analysis responses keyed by (sector, country, date)"""
+    
+    def __init__(self, url: str, ttl_seconds: int):
+        """
+        Initialize the cache
+        
+        Args:
+            url: Redis connection URL; an empty string disables caching
+            ttl_seconds: Lifetime of each cached analysis
+        """
+        self.enabled = bool(url)
+        self.ttl_seconds = ttl_seconds
+        self._redis = redis.from_url(url) if self.enabled else None
+        
+        if self.enabled:
+            logger.info(f"[REDIS CACHE] Enabled (ttl: {ttl_seconds}s)")
+    
+    def _key(self, sector: str, country: str) -> str:
+        """Build cache key; the date component rolls entries over daily"""
+        return f"analysis:{sector}:{country.lower()}:{datetime.now(timezone.utc).strftime('%Y%m%d')}"
+    
+    async def get(self, sector: str, country: str) -> Optional[StructuredAnalysisResponse]:
+        """Return cached analysis or None on miss (or if Redis is unavailable)"""
+        if not self.enabled:
+            return None
+        
+        try:
+            cached = await self._redis.get(self._key(sector, country))
+        except Exception as e:
+            logger.warning(f"[REDIS CACHE] Read failed: {e}")
+            return None
+        
+        if cached is None:
+            return None
+        
+        try:
+            return StructuredAnalysisResponse.model_validate_json(cached)
+        except ValueError as e:
+            # Stale schema or corrupted value (pydantic's ValidationError is a
+            # ValueError): drop it and treat as a miss
+            logger.warning(f"[REDIS CACHE] Discarding unreadable entry for {sector}: {e}")
+            await self.delete(sector, country)
+            return None
+    
+    async def delete(self, sector: str, country: str) -> None:
+        """Remove a cached analysis; failures are logged, not raised"""
+        try:
+            await self._redis.delete(self._key(sector, country))
+        except Exception as e:
+            logger.warning(f"[REDIS CACHE] Delete failed: {e}")
+    
+    async def set(self, sector: str, country: str, response: StructuredAnalysisResponse) -> None:
+        """Store analysis with the configured TTL; failures are logged, not raised"""
+        if not self.enabled:
+            return
+        
+        try:
+            await self._redis.set(self._key(sector, country), response.model_dump_json(), ex=self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"[REDIS CACHE] Write failed: {e}")
+
+
+# Global cache instance
+analysis_cache = AnalysisCache(settings.redis_url, settings.cache_ttl_seconds)
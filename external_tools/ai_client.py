@@ -3,179 +3,71 @@ AI Client Module
 Wrapper for OpenAI API interactions
 Centralizes prompts and model configuration
 """
-from openai import OpenAI
-from typing import Optional
+from openai import (
+    APIConnectionError,
+    AsyncOpenAI,
+    InternalServerError,
+    RateLimitError
+)
+from tenacity import (
+    retry,
+    stop_after_attempt,
+    wait_exponential_jitter,
+    retry_if_exception_type
+)
+from typing import AsyncIterator, List, Optional, Union
+import functools
 import logging
 import json
+import re
+import time
+
+import httpx
+import orjson
+import tiktoken
 
 from app.core.config import settings
+from app.core.clock import today
 
 logger = logging.getLogger(__name__)
 
-
-class OpenAIClient:
-    """Client for OpenAI API operations"""
-    
-    def __init__(self, default_model: str = "gpt-4o"):
-        """
-        Initialize OpenAI client with model flexibility
-        
-        Args:
-            default_model: Default model for analysis. Options:
-                - gpt-4o: Best quality, recommended for analysis (default)
-                - gpt-4o-mini: Fast, cost-effective, and high quality (recommended for speed)
-        """
-        self.client = OpenAI(api_key=settings.openai_api_key)
-        self.default_model = default_model
-        logger.info(f"[OPENAI] Initialized with default model: {default_model}")
-    
-    def generate_analysis(self, sector: str, country: str, raw_data: str, model: str = None) -> Optional[str]:
-        """
-        Generate initial market analysis report
-        
-        Args:
-            sector: Sector to analyze
-            country: Target country
-            raw_data: Collected market intelligence
-            model: Override default model (optional)
-            
-        Returns:
-            Markdown formatted analysis report or None on error
-        """
-        prompt = self._build_analysis_prompt(sector, country, raw_data)
-        model = model or self.default_model
-        
-        try:
-            logger.info(f"[OPENAI] Generating analysis for {sector} using {model}")
-            response = self.client.chat.completions.create(
-                model=model,
-                messages=[
-                    {"role": "system", "content": "You are a senior market analyst with 15 years of experience specializing in trade opportunities analysis and strategic market intelligence. You provide data-driven, actionable insights."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.2,  # Very low for maximum data extraction accuracy
-                max_tokens=4000  # Increased for comprehensive reports
-            )
-            
-            if response.choices and response.choices[0].message.content:
-                return response.choices[0].message.content
-            return None
-            
-        except Exception as e:
-            logger.error(f"[OPENAI] Analysis error: {e}")
-            return None
-    
-    def critique_report(self, sector: str, report: str, model: str = "gpt-4o-mini") -> Optional[str]:
-        """
-        Critique report quality and completeness
-        Uses faster gpt-4o-mini by default for deterministic validation
-        
-        Args:
-            sector: Sector being analyzed
-            report: Markdown report to critique
-            model: Model to use (default: gpt-4o-mini for speed)
-            
-        Returns:
-            Critique feedback (PASS or FAIL: reason) or None on error
-        """
-        prompt = self._build_critique_prompt(sector, report)
-        
-        try:
-            logger.info(f"[OPENAI] Critiquing report for {sector} using {model}")
-            response = self.client.chat.completions.create(
-                model=model,
-                response_format={"type": "json_object"},
-                messages=[
-                    {"role": "system", "content": "You are a quality assurance reviewer for market analysis reports. You MUST output valid JSON only. Evaluate reports fairly based on realistic expectations for web-scraped data. PASS reports that show reasonable effort at data extraction and meet baseline quality standards."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.2,  # Very low for consistent, strict evaluation
-                max_tokens=800  # More space for detailed critique
-            )
-            
-            if response.choices and response.choices[0].message.content:
-                content = response.choices[0].message.content.strip()
-                try:
-                    # Parse JSON output for structured decision
-                    critique_dict = json.loads(content)
-                    return critique_dict
-                except json.JSONDecodeError as je:
-                    logger.error(f"[OPENAI] Critique JSON decode error: {je}. Content: {content[:100]}...")
-                    # Fallback: Return PASS dictionary to avoid blocking
-                    return {"decision": "PASS", "reason": "JSON parse error - defaulting to PASS.", "raw_output": content[:200]}
-            
-            # No content returned
-            return {"decision": "PASS", "reason": "Empty response from critique model."}
-            
-        except Exception as e:
-            logger.error(f"[OPENAI] Critique API error: {e}")
-            # Fail-safe: Return PASS to prevent deadlock
-            return {"decision": "PASS", "reason": "API error - defaulting to PASS to prevent blocking."}
-    
-    def refine_report(self, sector: str, country: str, original_report: str, 
-                     critique: str, raw_data: str, model: str = "gpt-4o") -> Optional[str]:
-        """
-        Refine report based on critique feedback using GPT-4o
-        
-        Uses the same powerful model as the analyzer to ensure high-quality
-        refinements that address critique feedback effectively on the first attempt.
-        
-        Args:
-            sector: Sector being analyzed
-            country: Target country
-            original_report: Original report text
-            critique: Feedback from critic
-            raw_data: Original market data
-            model: Model to use (default: gpt-4o for complex refinement)
-            
-        Returns:
-            Refined report or original on error
-        """
-        prompt = self._build_refinement_prompt(sector, country, original_report, critique, raw_data)
-        
-        try:
-            logger.info(f"[OPENAI] Refining report for {sector} using {model}")
-            response = self.client.chat.completions.create(
-                model=model,
-                messages=[
-                    {"role": "system", "content": "You are a senior market analyst revising your report to meet strict editorial standards. You are meticulous about addressing every critique point and adding specific data."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.1,  # Extremely low for precise data extraction in refinement
-                max_tokens=4000  # Increased for comprehensive revision
-            )
-            
-            if response.choices and response.choices[0].message.content:
-                return response.choices[0].message.content
-            return original_report  # Return original if refinement fails
-            
-        except Exception as e:
-            logger.error(f"[OPENAI] Refinement error: {e}")
-            return original_report
-    
-    def _build_analysis_prompt(self, sector: str, country: str, raw_data: str) -> str:
-        """Build prompt for initial analysis with enhanced structure"""
-        from datetime import datetime
-        
-        return f"""**ROLE & EXPERTISE:**
-You are an expert {country} market analyst with 15 years of experience in trade opportunities analysis and strategic market intelligence. You have deep knowledge of the {sector} sector specifically.
-
-**CRITICAL CONSTRAINT:**
-You MUST strictly output a structured report in Markdown format ONLY. No preamble, no conversational text—just the formatted report.
-
-**INPUT DATA ANALYSIS:**
-The following market intelligence has been collected from multiple sources and is delimited by `---Article X---` markers. Each article contains SOURCE, TITLE, and content information.
-
-**AVAILABLE MARKET INTELLIGENCE:**
-{raw_data}
-
-**YOUR TASK:**
-Analyze the above data comprehensively and produce a professional trade opportunities report. Your analysis MUST focus on identifying **Actionable Trade Opportunities** in the **{sector}** sector.
-
-**MANDATORY OUTPUT STRUCTURE:**
-Create a detailed, data-driven markdown report with the following structure:
-
-# {sector.title()} Sector - Trade Opportunities Analysis ({country})
+# Closed "decision"/"reason" string fields in a partially streamed critique object
+_DECISION_RE = re.compile(r'"decision"\s*:\s*"(PASS|FAIL)"', re.I)
+_REASON_RE = re.compile(r'"reason"\s*:\s*("(?:[^"\\]|\\.)*")', re.S)
+
+# Token budget for raw_data, derived from the character cap applied upstream.
+# 3 chars/token leaves headroom over typical English/URL text (~3-4), so only
+# token-dense text (numbers, non-Latin scripts) is trimmed
+_CHARS_PER_TOKEN = 3
+_RAW_DATA_TOKEN_BUDGET = settings.max_raw_data_chars // _CHARS_PER_TOKEN
+
+# Retry policy for transient API failures: 429s, connection errors and 5xx
+_transient_retry = retry(
+    stop=stop_after_attempt(4),
+    wait=wait_exponential_jitter(initial=1, max=30),
+    retry=retry_if_exception_type((RateLimitError, APIConnectionError, InternalServerError)),
+    before_sleep=lambda rs: logger.warning(
+        f"[OPENAI] {type(rs.outcome.exception()).__name__}, retry {rs.attempt_number}/3"
+    ),
+    reraise=True
+)
+
+# Markdown-fenced JSON, in case a model wraps its object despite JSON mode
+_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*(.*?)\s*```\s*$", re.S)
+
+# Shared HTTP/2 connection pool: every node call reuses warm TLS connections
+# and concurrent requests are multiplexed over a single TCP connection.
+# Pool options live on the transport (httpx ignores client-level ones when a
+# transport is given); retries only cover failed connection attempts.
+_POOL_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=64)
+_POOL_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+_http_client = httpx.AsyncClient(
+    timeout=_POOL_TIMEOUT,
+    transport=httpx.AsyncHTTPTransport(http2=True, limits=_POOL_LIMITS, retries=2)
+)
+
+# Mandatory report layout, shared by the analysis, critique and refinement prompts
+_REPORT_STRUCTURE = """# <Sector> Sector - Trade Opportunities Analysis (<Country>)
 
 ## Executive Summary
 Provide a 3-4 sentence data-driven overview citing SPECIFIC figures, percentages, or timeframes from the source articles. Focus on current sector status and key opportunities.
@@ -239,29 +131,12 @@ Provide 5-7 specific, actionable steps for businesses looking to enter this sect
 Short to medium-term projections and anticipated changes.
 
 ---
-*Report generated on: {datetime.utcnow().strftime('%B %d, %Y')}*
-*Sector: {sector.title()}*
-*Market: {country}*
-
-**CRITICAL REQUIREMENTS:**
-1. **Data-Driven:** Extract and cite EVERY specific number, percentage, market size, growth rate, or quantitative metric from the articles. Prioritize numerical data extraction above all else.
-2. **Current:** Reference actual events, policies, or developments from {datetime.now().year}
-3. **Actionable:** Every opportunity must be specific, not generic (e.g., "Export surgical instruments to UAE" not just "Export opportunities exist")
-4. **Complete:** ALL sections must be substantial—no placeholders or "TBD" allowed
-5. **Source Attribution:** When citing specific data, mention the source (e.g., "According to Economic Times...")
-6. **No Hallucination:** Only use information from the provided articles—do not invent data
+*Report generated on: <Report Date>*
+*Sector: <Sector>*
+*Market: <Country>*"""
 
-**OUTPUT FORMAT:** Pure markdown starting with # {sector.title()} Sector - Trade Opportunities Analysis
-"""
-    
-    def _build_critique_prompt(self, sector: str, report: str) -> str:
-        """Build enhanced critique prompt with strict quality standards"""
-        return f"""**ROLE:** You are a senior editorial quality assurance specialist reviewing market analysis reports for institutional investors and trade organizations.
-
-**REPORT TO REVIEW:**
-{report}
-
-**STRICT QUALITY CRITERIA (All Must Pass):**
+# Editorial rubric, shared by the analysis, critique and refinement prompts
+_QUALITY_CRITERIA = """**STRICT QUALITY CRITERIA (All Must Pass):**
 
 1. **DATA SPECIFICITY**: 
    - Are there at least 2-3 SPECIFIC numbers, percentages, market sizes, or growth rates cited from the source articles?
@@ -286,7 +161,67 @@ Short to medium-term projections and anticipated changes.
 
 6. **NO HALLUCINATION**:
    - Does the report stay grounded in provided data?
-   - NO PASS if report invents statistics or events not in source data
+   - NO PASS if report invents statistics or events not in source data"""
+
+# Static system prompts. These are byte-identical across every sector so OpenAI's
+# automatic prompt caching (identical prefixes of 1024+ tokens) applies; all
+# per-request data goes in the final user message.
+_ANALYSIS_SYSTEM_PROMPT = """You are a senior market analyst with 15 years of experience specializing in trade opportunities analysis and strategic market intelligence. You provide data-driven, actionable insights.
+
+**ROLE & EXPERTISE:**
+You are an expert market analyst for the COUNTRY named in the user message, with deep knowledge of the SECTOR named in the user message.
+
+**CRITICAL CONSTRAINT:**
+You MUST strictly output a structured report in Markdown format ONLY. No preamble, no conversational text—just the formatted report.
+
+**INPUT DATA ANALYSIS:**
+The user message contains market intelligence collected from multiple sources, delimited by `---Article X---` markers. Each article contains SOURCE, TITLE, and content information.
+
+**YOUR TASK:**
+Analyze the provided data comprehensively and produce a professional trade opportunities report. Your analysis MUST focus on identifying **Actionable Trade Opportunities** in the requested sector.
+
+**MANDATORY OUTPUT STRUCTURE:**
+Create a detailed, data-driven markdown report with the following structure. Replace <Sector>, <Country> and <Report Date> with the values from the user message, and use the REPORT TITLE from the user message verbatim as the first line:
+
+{structure}
+
+**CRITICAL REQUIREMENTS:**
+1. **Data-Driven:** Extract and cite EVERY specific number, percentage, market size, growth rate, or quantitative metric from the articles. Prioritize numerical data extraction above all else.
+2. **Current:** Reference actual events, policies, or developments from the CURRENT YEAR given in the user message
+3. **Actionable:** Every opportunity must be specific, not generic (e.g., "Export surgical instruments to UAE" not just "Export opportunities exist")
+4. **Complete:** ALL sections must be substantial—no placeholders or "TBD" allowed
+5. **Source Attribution:** When citing specific data, mention the source (e.g., "According to Economic Times...")
+6. **No Hallucination:** Only use information from the provided articles—do not invent data
+
+**OUTPUT FORMAT:** Pure markdown starting with the REPORT TITLE from the user message
+
+**QUALITY REVIEW:**
+Your report will be reviewed by an editor against the following criteria before publication. Meet every one of them on the first draft.
+
+{criteria}""".format(structure=_REPORT_STRUCTURE, criteria=_QUALITY_CRITERIA)
+
+# Generate + post-hoc self-check prompt. Extends the analysis prompt so both share
+# the same cached prefix. The report is emitted first, so the critique judges the
+# text actually returned (a critique written before the report would judge an
+# unseen draft).
+_COMBINED_SYSTEM_PROMPT = _ANALYSIS_SYSTEM_PROMPT + """
+
+**SELF-CHECK WORKFLOW:**
+Write the report, then review the report you just wrote against the QUALITY REVIEW criteria as a strict editor would. Do not rewrite it after the review; the review decides whether it goes to a separate revision pass.
+
+**RESPONSE FORMAT (STRICT JSON OBJECT ONLY):**
+This overrides the markdown-only output constraint above. Return a valid JSON object with exactly two keys, in this order:
+- **report**: the report as a single markdown string; the OUTPUT FORMAT rules above apply to this string
+- **critique**: an object with "decision" (the string "PASS" or "FAIL", judging the REPORT above) and "reason" (what must be fixed, or why it passed)"""
+
+_CRITIQUE_SYSTEM_PROMPT = """You are a quality assurance reviewer for market analysis reports. You MUST output valid JSON only. Evaluate reports fairly based on realistic expectations for web-scraped data. PASS reports that show reasonable effort at data extraction and meet baseline quality standards.
+
+**ROLE:** You are a senior editorial quality assurance specialist reviewing market analysis reports for institutional investors and trade organizations. The report to review is in the user message.
+
+{criteria}
+
+**EXPECTED REPORT STRUCTURE (for the COMPLETENESS criterion):**
+{structure}
 
 **YOUR EVALUATION TASK:**
 Review the report against ALL criteria above. Be strict—this report will guide real business decisions.
@@ -314,29 +249,26 @@ You MUST return a valid JSON object with exactly two keys:
 - PASS if the report demonstrates reasonable data extraction effort and meets minimum thresholds (2-3 numbers)
 - Only FAIL if critical deficiencies exist (e.g., zero quantitative data, generic opportunities, completely missing sections)
 
-**CRITICAL:** Return ONLY the JSON object. No preamble, no markdown, no conversational text.
+**CRITICAL:** Return ONLY the JSON object. No preamble, no markdown, no conversational text.""".format(structure=_REPORT_STRUCTURE, criteria=_QUALITY_CRITERIA)
 
-Respond now:"""
-    
-    def _build_refinement_prompt(self, sector: str, country: str, 
-                                 original_report: str, critique: str, raw_data: str) -> str:
-        """Build enhanced refinement prompt with strict improvement focus"""
-        return f"""**ROLE:** You are a senior market analyst revising your previous report based on editorial feedback.
+# Critique plus formatter extraction in one response; shares the critique prompt prefix
+_EVALUATE_SYSTEM_PROMPT = _CRITIQUE_SYSTEM_PROMPT + """
 
-**CONTEXT:**
-You wrote a market analysis report for the {sector} sector in {country}, but it was rejected for quality issues.
+**ADDITIONAL EXTRACTION (same JSON object):**
+This extends the RESPONSE FORMAT above. Besides "decision" and "reason", the object MUST also contain:
+- **market_size**: the current or projected market size (e.g., "USD 400 billion by 2025")
+- **growth_cagr**: the growth rate/CAGR (e.g., "12% CAGR (2023-2028)")
+- **top_recommendations**: a list of the 3 most impactful recommendations (full sentence for each)
 
-**YOUR ORIGINAL REPORT:**
-{original_report}
+Copy exact text from the report, do not paraphrase. Use null (or an empty list) when the data is not in the report."""
 
-**EDITORIAL REJECTION REASONS:**
-{critique}
+_REFINEMENT_SYSTEM_PROMPT = """You are a senior market analyst revising your report to meet strict editorial standards. You are meticulous about addressing every critique point and adding specific data.
 
-**ORIGINAL SOURCE DATA (Re-analyze carefully):**
-{raw_data}
+**CONTEXT:**
+You wrote a market analysis report for the SECTOR and COUNTRY named in the user message, but it was rejected for quality issues. The user message contains your original report, the editorial rejection reasons, and the original source data.
 
 **YOUR REFINEMENT TASK:**
-Completely rewrite the report addressing EVERY SINGLE point in the editorial feedback. This is your final chance to meet publication standards.
+Completely rewrite the report addressing EVERY SINGLE point in the editorial feedback. Re-analyze the original source data carefully. This is your final chance to meet publication standards.
 
 **REFINEMENT REQUIREMENTS:**
 
@@ -353,26 +285,58 @@ Completely rewrite the report addressing EVERY SINGLE point in the editorial fee
 5. **Maintain Structure:** Keep the markdown format and section headers
 6. **Source Attribution:** Cite sources for key claims
 
-**CRITICAL:** The refined report MUST pass all quality criteria. Do not submit mediocre work.
+**EXPECTED REPORT STRUCTURE:**
+{structure}
 
-**OUTPUT:** Pure markdown report starting with the title:"""
-    
-    def format_report(self, markdown_report: str, sector: str) -> dict:
-        """
-        Extract structured data from final validated markdown report
-        Uses GPT-4o-mini for cost-effective data extraction
-        
-        Args:
-            markdown_report: The final validated markdown report
-            sector: Sector name for context
-            
-        Returns:
-            Dictionary with extracted data: {market_size, growth_cagr, top_recommendations}
-        """
-        prompt = f"""**TASK:** Extract key data points from this market analysis report.
+{criteria}
+
+**CRITICAL:** The refined report MUST pass all quality criteria. Do not submit mediocre work.
 
-**REPORT TO ANALYZE:**
-{markdown_report}
+**OUTPUT:** Pure markdown report starting with the title of the original report""".format(structure=_REPORT_STRUCTURE, criteria=_QUALITY_CRITERIA)
+
+# Structured-output schemas (strict mode: every property required, no extras)
+CRITIQUE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "decision": {"type": "string", "enum": ["PASS", "FAIL"]},
+        "reason": {"type": "string"}
+    },
+    "required": ["decision", "reason"],
+    "additionalProperties": False
+}
+
+FORMAT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "market_size": {"type": ["string", "null"]},
+        "growth_cagr": {"type": ["string", "null"]},
+        "top_recommendations": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": ["market_size", "growth_cagr", "top_recommendations"],
+    "additionalProperties": False
+}
+
+# Verdict first so a streamed FAIL can stop before the extraction fields
+EVALUATE_SCHEMA = {
+    "type": "object",
+    "properties": {**CRITIQUE_SCHEMA["properties"], **FORMAT_SCHEMA["properties"]},
+    "required": CRITIQUE_SCHEMA["required"] + FORMAT_SCHEMA["required"],
+    "additionalProperties": False
+}
+
+COMBINED_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "report": {"type": "string"},
+        "critique": CRITIQUE_SCHEMA
+    },
+    "required": ["report", "critique"],
+    "additionalProperties": False
+}
+
+_FORMAT_SYSTEM_PROMPT = """You are a data extraction specialist. You extract structured information from documents with perfect accuracy. You only return valid JSON.
+
+**TASK:** Extract key data points from the market analysis report in the user message.
 
 **EXTRACTION REQUIREMENTS:**
 1. Find the current or projected market size (e.g., "USD 400 billion", "₹5.2 trillion")
@@ -380,8 +344,7 @@ Completely rewrite the report addressing EVERY SINGLE point in the editorial fee
 3. Extract the top 3 most impactful recommendations (full sentence for each)
 
 **OUTPUT FORMAT (STRICT JSON):**
-```json
-{{
+{
   "market_size": "USD 400 billion by 2025",
   "growth_cagr": "12% CAGR (2023-2028)",
   "top_recommendations": [
@@ -389,43 +352,513 @@ Completely rewrite the report addressing EVERY SINGLE point in the editorial fee
     "Second recommendation here...",
     "Third recommendation here..."
   ]
-}}
-```
+}
 
 **RULES:**
 - If data not found, use null for that field
 - Copy exact text from report, do not paraphrase
 - Recommendations must be the most actionable and specific ones
-- Return ONLY the JSON, no other text
+- Return ONLY the JSON, no other text"""
+
+# User-message templates: only the small per-request slots are filled per call
+_ANALYSIS_USER_TEMPLATE = """**SECTOR:** {sector_title}
+**COUNTRY:** {country}
+**REPORT DATE:** {date}
+**CURRENT YEAR:** {year}
+**REPORT TITLE:** # {sector_title} Sector - Trade Opportunities Analysis ({country})
+
+**AVAILABLE MARKET INTELLIGENCE:**
+{raw_data}"""
+
+_CRITIQUE_USER_TEMPLATE = """**SECTOR:** {sector}
+
+**REPORT TO REVIEW:**
+{report}
+
+Respond now:"""
+
+_REFINEMENT_USER_TEMPLATE = """**SECTOR:** {sector}
+**COUNTRY:** {country}
+
+**YOUR ORIGINAL REPORT:**
+{original_report}
+
+**EDITORIAL REJECTION REASONS:**
+{critique}
+
+**ORIGINAL SOURCE DATA (Re-analyze carefully):**
+{raw_data}"""
+
+_FORMAT_USER_TEMPLATE = """**REPORT TO ANALYZE:**
+{report}
 
 **OUTPUT:**"""
 
+
+@functools.lru_cache(maxsize=1024)
+def _title(sector: str) -> str:
+    """Title-case a sector name; the set of sectors is small and repeats"""
+    return sector.title()
+
+
+@functools.cache
+def _encoding() -> "tiktoken.Encoding":
+    """gpt-4o tokenizer, loaded on first use (the first load may download the BPE file)"""
+    return tiktoken.get_encoding("o200k_base")
+
+
+def _truncate_tokens(text: str, budget: int) -> str:
+    """Trim text to at most budget tokens, logging when anything is cut"""
+    try:
+        encoding = _encoding()
+    except Exception as e:
+        # The upstream character caps still bound the prompt
+        logger.warning(f"[OPENAI] Tokenizer unavailable, skipping token budget: {e}")
+        return text
+    
+    tokens = encoding.encode(text)
+    if len(tokens) <= budget:
+        return text
+    
+    logger.warning(f"[OPENAI] Truncating raw data from {len(tokens)} to {budget} tokens")
+    return encoding.decode(tokens[:budget])
+
+
+def _json_schema(name: str, schema: dict) -> dict:
+    """response_format for strict structured outputs"""
+    return {"type": "json_schema", "json_schema": {"name": name, "schema": schema, "strict": True}}
+
+
+def _parse_json(content: str):
+    """Parse a model JSON reply with orjson, unwrapping a markdown fence if present"""
+    fenced = _FENCE_RE.match(content)
+    return orjson.loads(fenced.group(1) if fenced else content)
+
+
+class OpenAIClient:
+    """Client for OpenAI API operations"""
+    
+    def __init__(self, default_model: str = "gpt-4o"):
+        """
+        Initialize OpenAI client with model flexibility
+        
+        Args:
+            default_model: Default model for analysis. Options:
+                - gpt-4o: Best quality, recommended for analysis (default)
+                - gpt-4o-mini: Fast, cost-effective, and high quality (recommended for speed)
+        """
+        # SDK retries are disabled: transient errors are retried by _create_completion
+        self.client = AsyncOpenAI(api_key=settings.openai_api_key, http_client=_http_client, max_retries=0)
+        self.default_model = default_model
+        logger.info(f"[OPENAI] Initialized with default model: {default_model}")
+    
+    async def aclose(self) -> None:
+        """Close the shared async connection pool (call on application shutdown)"""
+        await self.client.close()
+    
+    async def warm_connection(self) -> None:
+        """
+        Establish the HTTP connection pool ahead of the first completion
+        
+        Issues a cheap model lookup so DNS/TLS setup overlaps with data
+        collection instead of delaying the analyzer call. Failures are ignored.
+        """
+        try:
+            await self.client.models.retrieve(self.default_model)
+            logger.debug("[OPENAI] Connection warmed")
+        except Exception as e:
+            logger.debug(f"[OPENAI] Connection warm-up failed: {e}")
+    
+    async def generate_analysis(self, sector: str, country: str, raw_data: str, model: str = None,
+                          stream: bool = False) -> Union[Optional[str], AsyncIterator[str]]:
+        """
+        Generate initial market analysis report
+        
+        Args:
+            sector: Sector to analyze
+            country: Target country
+            raw_data: Collected market intelligence
+            model: Override default model (optional)
+            stream: Return an async iterator of text chunks as they are generated
+            
+        Returns:
+            Markdown formatted analysis report or None on error.
+            With stream=True, an async iterator of chunks that raises on API errors.
+        """
+        messages = self._build_analysis_messages(sector, country, raw_data)
+        model = model or self.default_model
+        
+        if stream:
+            logger.info(f"[OPENAI] Streaming analysis for {sector} using {model}")
+            return self._stream_completion(
+                "Analysis",
+                model=model,
+                messages=messages,
+                temperature=0.2,
+                max_tokens=4000
+            )
+        
+        try:
+            logger.info(f"[OPENAI] Generating analysis for {sector} using {model}")
+            response = await self._create_completion(
+                model=model,
+                messages=messages,
+                temperature=0.2,  # Very low for maximum data extraction accuracy
+                max_tokens=4000  # Increased for comprehensive reports
+            )
+            
+            if response.choices and response.choices[0].message.content:
+                return response.choices[0].message.content
+            return None
+            
+        except Exception as e:
+            logger.error(f"[OPENAI] Analysis error: {e}")
+            return None
+    
+    async def generate_and_refine(self, sector: str, country: str, raw_data: str, model: str = None) -> Optional[dict]:
+        """
+        Generate a report and self-check it in a single completion
+        
+        Replaces the analyzer -> critic round trip when only one refinement
+        round is allowed. Strict structured output writes fields in schema
+        order, so the report comes first and the critique is a post-hoc
+        check of that final text; no revision happens inside this call.
+        
+        Args:
+            sector: Sector to analyze
+            country: Target country
+            raw_data: Collected market intelligence
+            model: Override default model (optional)
+            
+        Returns:
+            Dictionary {report, critique} or None on error
+        """
+        messages = self._build_analysis_messages(sector, country, raw_data, system=_COMBINED_SYSTEM_PROMPT)
+        model = model or self.default_model
+        
+        try:
+            logger.info(f"[OPENAI] Generating self-reviewed analysis for {sector} using {model}")
+            result = await self._complete_json(
+                model=model,
+                messages=messages,
+                name="combined_report",
+                schema=COMBINED_SCHEMA,
+                temperature=0.2,
+                max_tokens=4500  # Report plus a short critique
+            )
+            
+            if result and isinstance(result.get('report'), str) and result['report'].strip():
+                if not isinstance(result.get('critique'), dict):
+                    result['critique'] = {"decision": "PASS", "reason": "No self-critique returned."}
+                return result
+            return None
+            
+        except Exception as e:
+            logger.error(f"[OPENAI] Self-reviewed analysis error: {e}")
+            return None
+    
+    async def evaluate_and_extract(self, sector: str, report: str, model: str = None) -> dict:
+        """
+        Critique a report and extract its key metrics in a single completion
+        
+        Covers both the critique and format_report's extraction, so the
+        report is sent once. The extracted fields are only meaningful when the decision
+        is PASS (the report is final).
+        
+        Args:
+            sector: Sector being analyzed
+            report: Markdown report to critique
+            model: Override settings.critic_model (default: gpt-4o-mini for speed)
+            
+        Returns:
+            Dictionary {decision, reason, market_size, growth_cagr, top_recommendations};
+            fail-safe PASS dictionaries carry "fallback": True
+        """
+        messages = self._build_critique_messages(sector, report, system=_EVALUATE_SYSTEM_PROMPT)
+        model = model or settings.critic_model
+        
         try:
-            logger.info(f"[OPENAI] Extracting structured data for {sector} using gpt-4o-mini")
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
+            logger.info(f"[OPENAI] Evaluating and extracting report for {sector} using {model}")
+            result = await self._stream_verdict(
+                model=model,
+                messages=messages,
+                name="evaluation",
+                schema=EVALUATE_SCHEMA,
+                temperature=0.2,  # Very low for consistent, strict evaluation
+                max_tokens=1200  # Critique plus extracted fields
+            )
+            
+            if result is not None:
+                return result
+            
+            # No parseable content returned - return PASS dictionary to avoid blocking
+            return {"decision": "PASS", "reason": "Empty or invalid response from critique model.", "fallback": True}
+            
+        except Exception as e:
+            logger.error(f"[OPENAI] Evaluate API error: {e}")
+            # Fail-safe: Return PASS to prevent deadlock
+            return {"decision": "PASS", "reason": "API error - defaulting to PASS to prevent blocking.", "fallback": True}
+    
+    async def refine_report(self, sector: str, country: str, original_report: str, 
+                     critique: str, raw_data: str, model: str = "gpt-4o",
+                     stream: bool = False) -> Union[Optional[str], AsyncIterator[str]]:
+        """
+        Refine report based on critique feedback using GPT-4o
+        
+        Uses the same powerful model as the analyzer to ensure high-quality
+        refinements that address critique feedback effectively on the first attempt.
+        
+        Args:
+            sector: Sector being analyzed
+            country: Target country
+            original_report: Original report text
+            critique: Feedback from critic
+            raw_data: Original market data
+            model: Model to use (default: gpt-4o for complex refinement)
+            stream: Return an async iterator of text chunks as they are generated
+            
+        Returns:
+            Refined report or original on error.
+            With stream=True, an async iterator of chunks that raises on API errors.
+        """
+        messages = self._build_refinement_messages(sector, country, original_report, critique, raw_data)
+        
+        if stream:
+            logger.info(f"[OPENAI] Streaming refinement for {sector} using {model}")
+            return self._stream_completion(
+                "Refinement",
+                model=model,
+                messages=messages,
+                temperature=0.1,
+                max_tokens=4000
+            )
+        
+        try:
+            logger.info(f"[OPENAI] Refining report for {sector} using {model}")
+            response = await self._create_completion(
+                model=model,
+                messages=messages,
+                temperature=0.1,  # Extremely low for precise data extraction in refinement
+                max_tokens=4000  # Increased for comprehensive revision
+            )
+            
+            if response.choices and response.choices[0].message.content:
+                return response.choices[0].message.content
+            return original_report  # Return original if refinement fails
+            
+        except Exception as e:
+            logger.error(f"[OPENAI] Refinement error: {e}")
+            return original_report
+    
+    async def embed_texts(self, texts: List[str],
+                    model: str = "text-embedding-3-small") -> Optional[List[List[float]]]:
+        """
+        Embed several short texts in one batched request
+        
+        Args:
+            texts: Texts to embed (e.g. successive critique reasons)
+            model: Embedding model (default: text-embedding-3-small)
+            
+        Returns:
+            One unit-length vector per input text, in order, or None on error
+        """
+        try:
+            response = await self._create_embeddings(model=model, input=texts)
+            return [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
+            
+        except Exception as e:
+            logger.error(f"[OPENAI] Embedding error: {e}")
+            return None
+    
+    @_transient_retry
+    async def _create_completion(self, **kwargs):
+        """
+        Create a chat completion, retrying transient failures with jittered backoff
+        
+        Rate limits, connection errors and 5xx responses are retried up to three
+        times; anything else propagates immediately to the caller's handler.
+        For streams only opening the stream is retried.
+        """
+        return await self.client.chat.completions.create(**kwargs)
+    
+    @_transient_retry
+    async def _create_embeddings(self, **kwargs):
+        """Create embeddings with the same transient-failure retry policy"""
+        return await self.client.embeddings.create(**kwargs)
+    
+    async def _complete_json(self, model: str, messages: list, name: str, schema: dict,
+                             **kwargs) -> Optional[dict]:
+        """
+        Run a structured-output completion and parse the result
+        
+        Strict json_schema mode guarantees a schema-conforming object, so no
+        repair retry is needed. Only a refusal or a max_tokens cut-off can
+        yield unparseable content, and that returns None.
+        
+        Returns:
+            Parsed JSON object, or None if no valid object was returned
+        """
+        response = await self._create_completion(
+            model=model,
+            response_format=_json_schema(name, schema),
+            messages=messages,
+            **kwargs
+        )
+        
+        if not response.choices or not response.choices[0].message.content:
+            return None
+        
+        content = response.choices[0].message.content
+        try:
+            return _parse_json(content)
+        except orjson.JSONDecodeError as je:
+            logger.warning(f"[OPENAI] Incomplete structured output ({response.choices[0].finish_reason}): {je}")
+            return None
+    
+    async def _stream_verdict(self, model: str, messages: list, name: str, schema: dict,
+                              **kwargs) -> Optional[dict]:
+        """
+        Stream a JSON-mode critique and stop early on a FAIL verdict
+        
+        A FAIL only needs its decision and reason, so once both string
+        fields are closed the stream is abandoned and the remaining tokens
+        (the extraction fields) are never generated. PASS verdicts are read
+        to the end and parsed in full.
+        
+        Returns:
+            Parsed JSON object, or None if no valid object was returned
+        """
+        stream = await self._create_completion(
+            model=model,
+            response_format=_json_schema(name, schema),
+            messages=messages,
+            stream=True,
+            **kwargs
+        )
+        
+        buf = []
+        async for chunk in stream:
+            if not chunk.choices or not chunk.choices[0].delta.content:
+                continue
+            buf.append(chunk.choices[0].delta.content)
+            
+            # Check only once the delta could have closed a string field
+            if '"' not in chunk.choices[0].delta.content:
+                continue
+            content = "".join(buf)
+            decision = _DECISION_RE.search(content)
+            if not decision or decision.group(1).upper() != "FAIL":
+                continue
+            reason = _REASON_RE.search(content)
+            if reason:
+                await stream.close()
+                logger.info("[OPENAI] FAIL verdict received, stream closed early")
+                return {"decision": "FAIL", "reason": json.loads(reason.group(1), strict=False)}
+        
+        content = "".join(buf)
+        if not content:
+            return None
+        try:
+            return _parse_json(content)
+        except orjson.JSONDecodeError as je:
+            logger.warning(f"[OPENAI] Incomplete streamed structured output: {je}")
+            return None
+    
+    async def _stream_completion(self, label: str, **kwargs) -> AsyncIterator[str]:
+        """
+        Yield content deltas from a streamed chat completion
+        
+        Logs time-to-first-token so streaming latency is visible. API errors
+        propagate to the caller, which decides on its own fallback.
+        """
+        started = time.perf_counter()
+        first_token = True
+        
+        async for chunk in await self._create_completion(stream=True, **kwargs):
+            if not chunk.choices or not chunk.choices[0].delta.content:
+                continue
+            if first_token:
+                logger.info(f"[OPENAI] {label} first token after {time.perf_counter() - started:.2f}s")
+                first_token = False
+            yield chunk.choices[0].delta.content
+        
+        logger.info(f"[OPENAI] {label} stream completed in {time.perf_counter() - started:.2f}s")
+    
+    def _build_analysis_messages(self, sector: str, country: str, raw_data: str,
+                                 system: str = _ANALYSIS_SYSTEM_PROMPT) -> list:
+        """Build messages for initial analysis with enhanced structure"""
+        date, year = today()
+        user = _ANALYSIS_USER_TEMPLATE.format(
+            sector_title=_title(sector),
+            country=country,
+            date=date,
+            year=year,
+            raw_data=_truncate_tokens(raw_data, _RAW_DATA_TOKEN_BUDGET)
+        )
+        
+        return [
+            {"role": "system", "content": system},
+            {"role": "user", "content": user}
+        ]
+    
+    def _build_critique_messages(self, sector: str, report: str,
+                                 system: str = _CRITIQUE_SYSTEM_PROMPT) -> list:
+        """Build enhanced critique messages with strict quality standards"""
+        user = _CRITIQUE_USER_TEMPLATE.format(sector=sector, report=report)
+        
+        return [
+            {"role": "system", "content": system},
+            {"role": "user", "content": user}
+        ]
+    
+    def _build_refinement_messages(self, sector: str, country: str, 
+                                   original_report: str, critique: str, raw_data: str) -> list:
+        """Build enhanced refinement messages with strict improvement focus"""
+        user = _REFINEMENT_USER_TEMPLATE.format(
+            sector=sector,
+            country=country,
+            original_report=original_report,
+            critique=critique,
+            raw_data=_truncate_tokens(raw_data, _RAW_DATA_TOKEN_BUDGET)
+        )
+        
+        return [
+            {"role": "system", "content": _REFINEMENT_SYSTEM_PROMPT},
+            {"role": "user", "content": user}
+        ]
+    
+    async def format_report(self, markdown_report: str, sector: str, model: str = None) -> dict:
+        """
+        Extract structured data from final validated markdown report
+        Uses GPT-4o-mini by default for cost-effective data extraction
+        
+        Args:
+            markdown_report: The final validated markdown report
+            sector: Sector name for context
+            model: Override settings.formatter_model (default: gpt-4o-mini)
+            
+        Returns:
+            Dictionary with extracted data: {market_size, growth_cagr, top_recommendations}
+        """
+        user = _FORMAT_USER_TEMPLATE.format(report=markdown_report)
+
+        model = model or settings.formatter_model
+        
+        try:
+            logger.info(f"[OPENAI] Extracting structured data for {sector} using {model}")
+            result = await self._complete_json(
+                model=model,
                 messages=[
-                    {"role": "system", "content": "You are a data extraction specialist. You extract structured information from documents with perfect accuracy. You only return valid JSON."},
-                    {"role": "user", "content": prompt}
+                    {"role": "system", "content": _FORMAT_SYSTEM_PROMPT},
+                    {"role": "user", "content": user}
                 ],
+                name="summary",
+                schema=FORMAT_SCHEMA,
                 temperature=0.0,  # Zero temperature for deterministic extraction
                 max_tokens=800
             )
             
-            if response.choices and response.choices[0].message.content:
-                content = response.choices[0].message.content.strip()
-                
-                # Remove markdown code blocks if present
-                if content.startswith("```json"):
-                    content = content[7:]
-                if content.startswith("```"):
-                    content = content[3:]
-                if content.endswith("```"):
-                    content = content[:-3]
-                content = content.strip()
-                
-                # Parse JSON
-                result = json.loads(content)
+            if result is not None:
                 logger.info(f"[OPENAI] ✓ Successfully extracted structured data")
                 return result
             
@@ -4,41 +4,253 @@ Wrapper for web search and data collection from external sources
 Implements targeted querying, data cleaning, and source prioritization
 Includes retry logic and rate limit handling
 """
-from typing import List, Dict, Set
-from datetime import datetime
+from typing import List, Dict, Optional, Set, Tuple
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from operator import itemgetter
+from urllib.parse import parse_qs, urlparse
+import asyncio
+import copy
+import io
+import hashlib
+import heapq
 import logging
 import re
+import threading
 import time
-import random
-from gnews import GNews
-from duckduckgo_search import DDGS
+from bs4 import BeautifulSoup
+from cachetools import TTLCache
+import feedparser
+import httpx
 from tenacity import (
     retry,
     stop_after_attempt,
-    wait_exponential,
+    wait_exponential_jitter,
     retry_if_exception_type
 )
 from app.core.config import settings
+from app.core.clock import iso_now
 
 logger = logging.getLogger(__name__)
 
+# Text cleanup patterns, compiled once
+_WS_RE = re.compile(r'\s+')
+_NOISE_RE = re.compile(
+    r'(cookie policy|terms of service|privacy policy|sign up for.*newsletter|subscribe now|related articles?:?|read more:?|share this article|advertisement|\[.*?\])',
+    re.IGNORECASE
+)
+
+# Source-priority matchers: one alternation per term set, plain substring semantics
+_HIGH_QUALITY_SOURCE_RE = re.compile(
+    r'economic times|business standard|financial express|livemint|moneycontrol|reuters|bloomberg'
+    r'|ministry|government|rbi|sebi|nse|bse',
+    re.IGNORECASE
+)
+# Publisher domain -> priority bonus; parent domains (e.g. gov.in) cover their subdomains
+_SOURCE_SCORES: Dict[str, int] = {
+    'economictimes.indiatimes.com': 40,
+    'business-standard.com': 35,
+    'financialexpress.com': 35,
+    'livemint.com': 35,
+    'moneycontrol.com': 35,
+    'reuters.com': 40,
+    'bloomberg.com': 40,
+    'rbi.org.in': 45,
+    'sebi.gov.in': 45,
+    'nseindia.com': 40,
+    'bseindia.com': 40,
+    'gov.in': 40,
+    'nic.in': 35,
+}
+_TITLE_KEYWORD_RE = re.compile(r'trade|export|import|investment|growth|policy|opportunity|market', re.IGNORECASE)
+_RECENCY_RE = re.compile(r'2025|2024|latest|current|recent', re.IGNORECASE)
+
+_PRIORITY_KEY = itemgetter('priority')
+
+# Longest provider-requested pause we honor before letting retries fail fast
+_MAX_RETRY_AFTER = 30.0
+
+# Context handed to the LLM when every search fails; only sector/country vary
+_FALLBACK_CONTEXT_TEMPLATE = """---Fallback Context---
+SOURCE: System Context
+TITLE: {sector_title} Sector Analysis Framework - {country}
+
+**IMPORTANT INSTRUCTION TO AI:**
+No external search data is currently available due to API rate limiting. 
+
+You MUST generate a report based on:
+1. Your general knowledge of the {country} {sector} sector
+2. Standard industry analysis frameworks
+3. General economic trends in {country}
+
+**MANDATORY DISCLAIMERS:**
+- All data points MUST be labeled as "Estimated" or "Approximate"
+- Source all claims as "Industry estimates" or "General market observations"
+- Focus on QUALITATIVE analysis over specific numbers
+- Emphasize that this is a preliminary analysis pending data availability
+- Recommend data sources for future validation
+
+**REPORT STRUCTURE:**
+- Use conditional language (e.g., "typically", "generally", "estimated")
+- Provide framework for analysis rather than specific claims
+- List data sources that SHOULD be consulted for verification
+- Make it clear this is based on general industry knowledge, not real-time data
+
+---End Fallback Context---"""
+
+
+def _domain(url: str) -> str:
+    """Lower-cased host of a URL without a leading www."""
+    host = urlparse(url).netloc.lower() if url else ''
+    return host[4:] if host.startswith('www.') else host
+
+
+def _source_bonus(domain: str) -> Optional[int]:
+    """
+    Score of the closest registered parent of a domain, or None if unknown
+    
+    Labels are dropped from the left until one matches, so
+    in.finance.yahoo.com resolves to finance.yahoo.com, then yahoo.com.
+    """
+    while domain:
+        bonus = _SOURCE_SCORES.get(domain)
+        if bonus is not None:
+            return bonus
+        _, _, domain = domain.partition('.')
+    return None
+
+
+def _html_to_text(html: str) -> str:
+    """Strip markup from an RSS summary"""
+    return BeautifulSoup(html, "html.parser").get_text(" ", strip=True) if html else ""
+
+
+def _unwrap_ddg_redirect(href: str) -> str:
+    """Resolve DuckDuckGo's //duckduckgo.com/l/?uddg=<url> redirect links"""
+    if "uddg=" in href:
+        target = parse_qs(urlparse(href).query).get("uddg")
+        if target:
+            return target[0]
+    return href
+
+
+class TokenBucket:
+    """
+    Adaptive token bucket pacing requests to one search provider
+    
+    The refill rate grows gently after each success (multiplicative, capped
+    by an additive step) and halves after a failure, so concurrent queries
+    converge on the rate the provider sustains instead of retrying in
+    lockstep after every rate-limit burst.
+    """
+    
+    def __init__(self, rate: float = 2.0, capacity: float = 3.0,
+                 min_rate: float = 0.2, max_rate: float = 10.0,
+                 increase_factor: float = 1.1, increase_step: float = 0.5,
+                 decrease_factor: float = 0.5):
+        self.rate = rate
+        self.capacity = capacity
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase_factor = increase_factor
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self.next_ok_at = 0.0  # Monotonic time before which the provider asked us to wait
+    
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+    
+    async def acquire(self) -> None:
+        """Wait until a token is available, then consume it"""
+        while True:
+            wait = self.next_ok_at - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+            
+            # No await between refill and consume, so waiters can't double-spend a token
+            self._refill()
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                return
+            await asyncio.sleep((1.0 - self.tokens) / self.rate)
+    
+    def increase_rate(self) -> None:
+        """Probe for more throughput after a successful request"""
+        self.rate = min(self.max_rate, self.rate * self.increase_factor, self.rate + self.increase_step)
+    
+    def decrease_rate(self) -> None:
+        """Back off after a failed or rate-limited request"""
+        self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+    
+    def pause(self, seconds: float) -> None:
+        """Hold all requests for the given time (e.g. from a Retry-After header)"""
+        self.next_ok_at = max(self.next_ok_at, time.monotonic() + seconds)
+
+
+def _retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    """Parse a Retry-After header (delta seconds or HTTP date), capped at _MAX_RETRY_AFTER"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0.0), _MAX_RETRY_AFTER)
+
 
 class DataCollector:
-    """Collects market data from web sources using GNews API with DuckDuckGo fallback"""
+    """Collects market data from web sources using Google News RSS with DuckDuckGo fallback"""
+    
+    GNEWS_RSS_URL = "https://news.google.com/rss/search"
+    DDG_HTML_URL = "https://html.duckduckgo.com/html/"
     
     def __init__(self):
-        self.use_gnews = bool(settings.gnews_api_key)
+        self.use_gnews = settings.use_google_news_rss
+        
+        # One keep-alive pool for all searches: repeat queries skip the TCP/TLS handshake,
+        # and with HTTP/2 (h2 extra) the concurrent queries to one host share a
+        # single connection as parallel streams
+        self._http = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            timeout=20.0,
+            follow_redirects=True,
+            headers={"User-Agent": "Mozilla/5.0 (compatible; TradeOpportunitiesAPI/1.0)"}
+        )
+        
+        # Recent results per (sector, country); sector news moves over hours, not seconds
+        self._cache: TTLCache = TTLCache(maxsize=256, ttl=settings.search_cache_ttl_seconds)
+        
+        # Cleaned body, dedup hash and priority per raw article, shared across
+        # sectors: popular stories resurface in several sectors' searches.
+        # Filled from worker threads, hence the lock
+        self._articles: TTLCache = TTLCache(maxsize=10000, ttl=settings.article_memo_ttl_seconds)
+        self._articles_lock = threading.Lock()
+        
+        # Per-provider request pacing, adapted to each provider's observed limits
+        self._buckets: Dict[str, TokenBucket] = {"gnews": TokenBucket(), "duckduckgo": TokenBucket()}
         
-        # Initialize GNews client
         if self.use_gnews:
-            self.gnews = GNews(language='en', country='IN', max_results=3, period='7d')
-            logger.info("[DATA COLLECTOR] Using GNews API")
+            logger.info("[DATA COLLECTOR] Using Google News RSS")
         else:
             logger.warning("[DATA COLLECTOR] Using DuckDuckGo fallback (may be rate limited)")
     
-    def _search_gnews(self, query: str, max_results: int = 3) -> List:
+    async def aclose(self) -> None:
+        """Close the shared HTTP connection pool (call on application shutdown)"""
+        await self._http.aclose()
+    
+    async def _search_gnews(self, query: str, max_results: int = 3) -> List:
         """
-        Search using GNews API
+        Search Google News via its RSS endpoint (last 7 days, India edition)
         
         Args:
             query: Search query string
@@ -48,36 +260,68 @@ class DataCollector:
             List of search results in standardized format
         """
         try:
-            logger.debug(f"[DATA COLLECTOR] Searching with GNews API: {query}")
-            articles = self.gnews.get_news(query)
+            logger.debug(f"[DATA COLLECTOR] Searching Google News RSS: {query}")
+            response = await self._paced_request(
+                "gnews", "GET", self.GNEWS_RSS_URL,
+                params={"q": f"{query} when:7d", "hl": "en-IN", "gl": "IN", "ceid": "IN:en"}
+            )
+            feed = feedparser.parse(response.content)
             
-            # Convert GNews format to our standard format
+            # Convert RSS entries to our standard format
             results = []
-            for article in articles[:max_results]:
+            for entry in feed.entries[:max_results]:
                 results.append({
-                    'title': article.get('title', 'No Title'),
-                    'body': article.get('description', ''),
-                    'source': article.get('publisher', {}).get('title', 'Unknown'),
-                    'href': article.get('url', ''),
-                    'published': article.get('published date', '')
+                    'title': entry.get('title', 'No Title'),
+                    'body': _html_to_text(entry.get('summary', '')),
+                    'source': entry.get('source', {}).get('title', 'Unknown'),
+                    # The entry link is a news.google.com redirect; the publisher is in source.href
+                    'domain': _domain(entry.get('source', {}).get('href', '')),
+                    'href': entry.get('link', ''),
+                    'published': entry.get('published', '')
                 })
             
-            logger.debug(f"[DATA COLLECTOR] ✓ GNews returned {len(results)} articles")
+            logger.debug(f"[DATA COLLECTOR] ✓ Google News returned {len(results)} articles ({response.http_version})")
             return results
             
         except Exception as e:
-            logger.warning(f"[DATA COLLECTOR] GNews search failed: {e}")
+            logger.warning(f"[DATA COLLECTOR] Google News search failed: {e}")
             raise
     
+    async def _paced_request(self, provider: str, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send one request through the provider's token bucket
+        
+        Successful responses raise the provider's rate; errors lower it
+        before the exception propagates. A Retry-After on a 429/503 pauses
+        every request to that provider until it elapses, even if requests
+        already in flight succeed meanwhile.
+        """
+        bucket = self._buckets[provider]
+        await bucket.acquire()
+        try:
+            response = await self._http.request(method, url, **kwargs)
+            if response.status_code in (429, 503):
+                retry_after = _retry_after_seconds(response)
+                if retry_after is not None:
+                    bucket.pause(retry_after)
+                    logger.info(f"[DATA COLLECTOR] {provider} asked to wait {retry_after:.1f}s")
+            response.raise_for_status()
+        except Exception:
+            bucket.decrease_rate()
+            logger.debug(f"[DATA COLLECTOR] {provider} rate lowered to {bucket.rate:.2f} req/s")
+            raise
+        bucket.increase_rate()
+        return response
+    
     @retry(
         stop=stop_after_attempt(2),
-        wait=wait_exponential(multiplier=2, min=4, max=15),
+        wait=wait_exponential_jitter(initial=0.25, max=15),
         retry=retry_if_exception_type(Exception),
         reraise=True
     )
-    def _search_duckduckgo(self, query: str, max_results: int = 3) -> List:
+    async def _search_duckduckgo(self, query: str, max_results: int = 3) -> List:
         """
-        Fallback search using DuckDuckGo (with retry)
+        Fallback search using the DuckDuckGo HTML endpoint (with retry)
         
         Args:
             query: Search query string
@@ -91,18 +335,34 @@ class DataCollector:
         """
         try:
             logger.debug(f"[DATA COLLECTOR] Attempting DuckDuckGo search (fallback)...")
-            ddgs = DDGS(timeout=20)
-            results = list(ddgs.text(query, max_results=max_results))
-            logger.debug(f"[DATA COLLECTOR] ✓ DuckDuckGo returned {len(results)} results")
+            response = await self._paced_request("duckduckgo", "POST", self.DDG_HTML_URL, data={"q": query})
+            soup = BeautifulSoup(response.text, "html.parser")
+            
+            results = []
+            for item in soup.select("div.result")[:max_results]:
+                link = item.select_one("a.result__a")
+                if link is None:
+                    continue
+                href = _unwrap_ddg_redirect(link.get("href", ""))
+                snippet = item.select_one(".result__snippet")
+                results.append({
+                    'title': link.get_text(" ", strip=True),
+                    'body': snippet.get_text(" ", strip=True) if snippet else '',
+                    'source': urlparse(href).netloc or 'Unknown',
+                    'domain': _domain(href),
+                    'href': href
+                })
+            
+            logger.debug(f"[DATA COLLECTOR] ✓ DuckDuckGo returned {len(results)} results ({response.http_version})")
             return results
         except Exception as e:
             logger.debug(f"[DATA COLLECTOR] DuckDuckGo search failed: {e}")
             raise
     
-    def _search_with_retry(self, query: str, max_results: int = 3) -> List:
+    async def _search_with_retry(self, query: str, max_results: int = 3) -> List:
         """
         Execute search with automatic provider selection and fallback
-        Uses GNews API if available, falls back to DuckDuckGo
+        Uses Google News if enabled, falls back to DuckDuckGo
         
         Args:
             query: Search query string
@@ -113,15 +373,33 @@ class DataCollector:
         """
         if self.use_gnews:
             try:
-                return self._search_gnews(query, max_results)
+                return await self._search_gnews(query, max_results)
             except Exception as e:
-                logger.warning(f"[DATA COLLECTOR] GNews failed, trying DuckDuckGo fallback: {e}")
+                logger.warning(f"[DATA COLLECTOR] Google News failed, trying DuckDuckGo fallback: {e}")
                 # Fall through to DuckDuckGo
         
         # Use DuckDuckGo (either as primary or fallback)
-        return self._search_duckduckgo(query, max_results)
+        return await self._search_duckduckgo(query, max_results)
+    
+    async def _run_query(self, idx: int, query: str) -> List:
+        """
+        Run one search query on the shared connection pool
+        
+        Queries run concurrently with no fixed stagger: pacing comes from the
+        per-provider token buckets, which also honor Retry-After, and
+        tenacity retries the odd transient failure.
+        
+        Args:
+            idx: 1-based query index
+            query: Search query string
+            
+        Returns:
+            List of search results
+        """
+        logger.debug(f"[DATA COLLECTOR] Query {idx}: {query}")
+        return await self._search_with_retry(query, 3)
     
-    def collect_sector_data(self, sector: str, country: str = "India") -> Dict:
+    async def collect_sector_data(self, sector: str, country: str = "India") -> Dict:
         """
         Collect comprehensive data about a sector
         
@@ -132,6 +410,14 @@ class DataCollector:
         Returns:
             Dictionary with search results and raw data
         """
+        key = (sector.strip().lower(), country.strip().lower())
+        cached = self._cache.get(key)
+        if cached is not None:
+            logger.info(f"[DATA COLLECTOR] Cache hit for: {sector} in {country}")
+            data = copy.deepcopy(cached)
+            data['timestamp'] = iso_now()
+            return data
+        
         logger.info(f"[DATA COLLECTOR] Collecting data for: {sector} in {country}")
         
         # Prepare targeted search queries (reduced to 3 to avoid rate limiting)
@@ -142,88 +428,38 @@ class DataCollector:
             f"{country} {sector} market size companies trends {year}"
         ]
         
-        all_results = []
-        raw_texts = []
-        seen_content: Set[str] = set()  # For deduplication
+        # Execute searches concurrently; results are processed in query order
+        responses = await asyncio.gather(
+            *(self._run_query(idx, query) for idx, query in enumerate(queries, 1)),
+            return_exceptions=True
+        )
         
-        # Execute searches with prioritization and rate limit handling
-        for idx, query in enumerate(queries, 1):
-            try:
-                logger.debug(f"[DATA COLLECTOR] Query {idx}/{len(queries)}: {query}")
-                
-                # Add small delay between queries (GNews is more generous than DuckDuckGo)
-                if idx > 1:
-                    delay = random.uniform(1.0, 2.0) if self.use_gnews else random.uniform(5.0, 8.0)
-                    logger.debug(f"[DATA COLLECTOR] Waiting {delay:.1f}s before next query...")
-                    time.sleep(delay)
-                
-                # Execute search with retry logic (backoff handled by tenacity)
-                results = self._search_with_retry(query, max_results=3)
-                
-                for result in results:
-                    title = result.get('title', 'No Title')
-                    body = result.get('body', '')
-                    source = result.get('source', 'Unknown')
-                    url = result.get('href', '')
-                    
-                    # Clean and normalize text
-                    cleaned_body = self._clean_text(body)
-                    
-                    # Deduplicate based on content similarity
-                    content_hash = self._generate_content_hash(cleaned_body)
-                    if content_hash in seen_content:
-                        logger.debug(f"[DATA COLLECTOR] Skipping duplicate: {title[:50]}...")
-                        continue
-                    seen_content.add(content_hash)
-                    
-                    # Prioritize based on source quality
-                    priority = self._assess_source_priority(source, title, body)
-                    
-                    all_results.append({
-                        'title': title,
-                        'snippet': cleaned_body[:300],  # Keep snippet clean
-                        'url': url,
-                        'source': source,
-                        'priority': priority,
-                        'query_type': self._classify_query(idx)
-                    })
-                    
-                    # Format with clear delimiters for LLM
-                    article_text = self._format_article(
-                        article_num=len(raw_texts) + 1,
-                        title=title,
-                        source=source,
-                        content=cleaned_body,
-                        url=url
-                    )
-                    raw_texts.append(article_text)
-                    
-            except Exception as e:
-                logger.warning(f"[DATA COLLECTOR] Query {idx} failed after retries: {e}")
-                # Continue with other queries even if one fails
-                continue
+        # Cleanup, hashing and scoring are pure CPU work: run them in one
+        # worker-thread hop so the event loop keeps serving other requests
+        all_results = await asyncio.to_thread(self._process_results, responses)
         
         # Sort by priority and limit to top sources
-        all_results.sort(key=lambda x: x['priority'], reverse=True)
-        top_results = all_results[:8]  # Limit to top 8 most relevant sources
+        top_results = heapq.nlargest(8, all_results, key=_PRIORITY_KEY)  # Limit to top 8 most relevant sources
         
         # Determine data quality
         data_quality = 'high' if len(top_results) >= 5 else 'moderate' if len(top_results) >= 3 else 'low'
         
         # Prepare final cleaned corpus using ONLY top-quality sources (aligns AI context with UI)
         if top_results:
-            # Build raw_data from top_results only (not all collected articles)
-            top_raw_texts = []
+            # Write only the top results, with clear delimiters for LLM parsing
+            buf = io.StringIO()
             for idx, result in enumerate(top_results, 1):
-                article_text = self._format_article(
+                if idx > 1:
+                    buf.write("\n\n")
+                self._write_article(
+                    buf,
                     article_num=idx,
                     title=result['title'],
                     source=result['source'],
                     content=result['snippet'],  # Use cleaned snippet
                     url=result['url']
                 )
-                top_raw_texts.append(article_text)
-            raw_data = "\n\n".join(top_raw_texts)
+            raw_data = buf.getvalue()
         else:
             raw_data = self._generate_fallback_context(sector, country)
             logger.warning("[DATA COLLECTOR] No search results, using fallback")
@@ -231,7 +467,7 @@ class DataCollector:
         data = {
             'sector': sector,
             'country': country,
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': iso_now(),
             'search_results': top_results,
             'raw_data': raw_data,
             'total_results': len(top_results),
@@ -240,8 +476,105 @@ class DataCollector:
         }
         
         logger.info(f"[DATA COLLECTOR] Collected {len(top_results)} high-quality results (quality: {data_quality})")
+        
+        # Don't pin a failed search (fallback context) for the whole TTL
+        if top_results:
+            self._cache[key] = copy.deepcopy(data)
         return data
     
+    async def collect_many(self, sectors: List[str], country: str = "India") -> List[Dict]:
+        """
+        Collect data for several sectors concurrently
+        
+        All sectors share the connection pool and the per-provider token
+        buckets, so fan-out is paced by what the providers sustain.
+        
+        Args:
+            sectors: Sectors to research
+            country: Target country
+            
+        Returns:
+            One collect_sector_data result per sector, in input order
+        """
+        return await asyncio.gather(*(self.collect_sector_data(sector, country) for sector in sectors))
+    
+    def _process_results(self, responses: List) -> List[Dict]:
+        """
+        Clean, deduplicate and score the raw results of every query
+        
+        Args:
+            responses: Per-query result lists (or exceptions), in query order
+            
+        Returns:
+            Processed results in collection order
+        """
+        all_results = []
+        seen_raw: Set[bytes] = set()  # Exact repeats, caught before any processing
+        seen_content: Set[bytes] = set()  # Near-duplicates, on the cleaned body
+        
+        for idx, results in enumerate(responses, 1):
+            if isinstance(results, Exception):
+                logger.warning(f"[DATA COLLECTOR] Query {idx} failed after retries: {results}")
+                # Continue with other queries even if one fails
+                continue
+            
+            for result in results:
+                title = result.get('title', 'No Title')
+                body = result.get('body', '')
+                source = result.get('source', 'Unknown')
+                url = result.get('href', '')
+                
+                # Same story returned by several queries: drop it before cleaning
+                raw_key = hashlib.blake2b(body.encode('utf-8', 'ignore')[:512], digest_size=8).digest()
+                if raw_key in seen_raw:
+                    logger.debug(f"[DATA COLLECTOR] Skipping duplicate: {title[:50]}...")
+                    continue
+                seen_raw.add(raw_key)
+                
+                # Clean, hash and score (memoized across recent collections)
+                domain = result.get('domain', '')
+                cleaned_body, content_hash, priority = self._process_article(title, body, source, domain)
+                
+                # Deduplicate based on content similarity
+                if content_hash in seen_content:
+                    logger.debug(f"[DATA COLLECTOR] Skipping duplicate: {title[:50]}...")
+                    continue
+                seen_content.add(content_hash)
+                
+                all_results.append({
+                    'title': title,
+                    'snippet': cleaned_body[:300],  # Keep snippet clean
+                    'url': url,
+                    'source': source,
+                    'priority': priority,
+                    'query_type': self._classify_query(idx)
+                })
+        
+        return all_results
+    
+    def _process_article(self, title: str, body: str, source: str, domain: str = '') -> Tuple[str, bytes, int]:
+        """
+        Clean, hash and score one article, reusing recent work
+        
+        Returns:
+            (cleaned_body, content_hash, priority) tuple
+        """
+        key = (source, domain, title, body)
+        with self._articles_lock:
+            processed = self._articles.get(key)
+        if processed is not None:
+            return processed
+        
+        cleaned_body = self._clean_text(body)
+        processed = (
+            cleaned_body,
+            self._generate_content_hash(cleaned_body),
+            self._assess_source_priority(source, title, body, domain)
+        )
+        with self._articles_lock:
+            self._articles[key] = processed
+        return processed
+    
     def _generate_fallback_context(self, sector: str, country: str) -> str:
         """
         Generate minimal context when search fails
@@ -253,32 +586,7 @@ class DataCollector:
         Returns:
             Fallback context string
         """
-        return f"""---Fallback Context---
-SOURCE: System Context
-TITLE: {sector.title()} Sector Analysis Framework - {country}
-
-**IMPORTANT INSTRUCTION TO AI:**
-No external search data is currently available due to API rate limiting. 
-
-You MUST generate a report based on:
-1. Your general knowledge of the {country} {sector} sector
-2. Standard industry analysis frameworks
-3. General economic trends in {country}
-
-**MANDATORY DISCLAIMERS:**
-- All data points MUST be labeled as "Estimated" or "Approximate"
-- Source all claims as "Industry estimates" or "General market observations"
-- Focus on QUALITATIVE analysis over specific numbers
-- Emphasize that this is a preliminary analysis pending data availability
-- Recommend data sources for future validation
-
-**REPORT STRUCTURE:**
-- Use conditional language (e.g., "typically", "generally", "estimated")
-- Provide framework for analysis rather than specific claims
-- List data sources that SHOULD be consulted for verification
-- Make it clear this is based on general industry knowledge, not real-time data
-
----End Fallback Context---"""
+        return _FALLBACK_CONTEXT_TEMPLATE.format(sector_title=sector.title(), sector=sector, country=country)
     
     def _clean_text(self, text: str) -> str:
         """
@@ -294,45 +602,50 @@ You MUST generate a report based on:
             return ""
         
         # Remove excessive whitespace and tabs
-        text = re.sub(r'\s+', ' ', text)
+        text = _WS_RE.sub(' ', text)
         
         # Remove common web noise patterns
-        noise = r'(cookie policy|terms of service|privacy policy|sign up for.*newsletter|subscribe now|related articles?:?|read more:?|share this article|advertisement|\[.*?\])'
-        text = re.sub(noise, '', text, flags=re.IGNORECASE)
+        text = _NOISE_RE.sub('', text)
         return text.strip()
     
-    def _generate_content_hash(self, text: str) -> str:
-        """Generate a simple hash for deduplication"""
-        return re.sub(r'\W+', '', text.lower())[:100]
+    def _generate_content_hash(self, text: str) -> bytes:
+        """
+        Generate a fixed-cost hash for deduplication
+        
+        Keys on the opening of the (already whitespace-normalized) body, so
+        syndicated copies with different tails still collapse to one entry.
+        """
+        return hashlib.blake2b(text[:200].lower().encode('utf-8', 'ignore'), digest_size=16).digest()
     
-    def _assess_source_priority(self, source: str, title: str, body: str) -> int:
+    def _assess_source_priority(self, source: str, title: str, body: str, domain: str = '') -> int:
         """
         Assess source quality and relevance
         
+        Args:
+            source: Publisher display name
+            title: Article title
+            body: Article body
+            domain: Publisher domain, when known
+        
         Returns:
             Priority score (higher is better)
         """
         score = 50  # Base score
         
-        # Prioritize financial/business news sources
-        high_quality_sources = [
-            'economic times', 'business standard', 'financial express',
-            'livemint', 'moneycontrol', 'reuters', 'bloomberg',
-            'ministry', 'government', 'rbi', 'sebi', 'nse', 'bse'
-        ]
-        
-        source_lower = source.lower()
-        for quality_source in high_quality_sources:
-            if quality_source in source_lower:
-                score += 30
-                break
+        # Prioritize financial/business news sources: known domains score
+        # individually, anything else falls back to the publisher-name match
+        bonus = _source_bonus(domain)
+        if bonus is not None:
+            score += bonus
+        elif _HIGH_QUALITY_SOURCE_RE.search(source):
+            score += 30
         
         # Bonus for key terms in title
-        if any(term in title.lower() for term in ['trade', 'export', 'import', 'investment', 'growth', 'policy', 'opportunity', 'market']):
+        if _TITLE_KEYWORD_RE.search(title):
             score += 5
         
         # Bonus for recent/current data indicators
-        if any(ind in (title + ' ' + body).lower() for ind in ['2025', '2024', 'latest', 'current', 'recent']):
+        if _RECENCY_RE.search(title) or _RECENCY_RE.search(body):
             score += 3
         
         return score
@@ -341,30 +654,51 @@ You MUST generate a report based on:
         """Classify query type for metadata"""
         return {1: 'Trade & Growth', 2: 'Policy & Investment', 3: 'Market Data'}.get(query_index, 'General')
     
-    def _format_article(self, article_num: int, title: str, source: str, 
-                       content: str, url: str) -> str:
+    def _write_article(self, buf: io.StringIO, article_num: int, title: str, source: str,
+                       content: str, url: str) -> None:
         """
-        Format article with clear delimiters for LLM parsing
+        Write article with clear delimiters for LLM parsing
         
         Args:
+            buf: Buffer the corpus is assembled in
             article_num: Article number
             title: Article title
             source: Source name
             content: Article content
             url: Source URL
-            
-        Returns:
-            Formatted article string
         """
-        return f"""---Article {article_num}---
-SOURCE: {source}
-TITLE: {title}
-URL: {url}
+        num = str(article_num)
+        buf.write("---Article ")
+        buf.write(num)
+        buf.write("---\nSOURCE: ")
+        buf.write(source)
+        buf.write("\nTITLE: ")
+        buf.write(title)
+        buf.write("\nURL: ")
+        buf.write(url)
+        buf.write("\n\n")
+        buf.write(content)
+        buf.write("\n\n---End Article ")
+        buf.write(num)
+        buf.write("---")
+
+
+# Global collector instance, created on first use so importing this module
+# opens no connection pool (main.py creates it on startup, inside the loop)
+_data_collector: Optional[DataCollector] = None
 
-{content}
 
----End Article {article_num}---"""
+def get_data_collector() -> DataCollector:
+    """Return the shared DataCollector, creating it on first call"""
+    global _data_collector
+    if _data_collector is None:
+        _data_collector = DataCollector()
+    return _data_collector
 
 
-# Global collector instance
-data_collector = DataCollector()
+async def close_data_collector() -> None:
+    """Close the shared DataCollector's connection pool, if it was created"""
+    global _data_collector
+    if _data_collector is not None:
+        await _data_collector.aclose()
+        _data_collector = None
@@ -3,10 +3,15 @@ Trade Opportunities API - Main Entry Point
 FastAPI application with LangGraph multi-agent workflow
 """
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+import asyncio
 import logging
 
 from app.api.v1.endpoints import router
 from app.core.config import settings
+from app.services.in_memory_store import rate_limiter
+from external_tools.ai_client import openai_client
+from external_tools.data_collector import close_data_collector, get_data_collector
 
 # Configure logging
 logging.basicConfig(
@@ -53,6 +58,7 @@ app = FastAPI(
     - Per user/API key tracking
     """,
     version="1.0.0",
+    default_response_class=ORJSONResponse,  # orjson serializes the large markdown payloads much faster
     docs_url="/docs",
     redoc_url="/redoc",
     contact={
@@ -79,21 +85,36 @@ async def startup_event():
     logger.info(f"🔒 Rate Limits: {settings.rate_limit_per_minute}/min, {settings.rate_limit_per_hour}/hr")
     logger.info(f"🔄 Max Refinement Iterations: {settings.max_refinement_iterations}")
     logger.info("=" * 60)
+    
+    # Create the search client (and its connection pool) inside the running loop
+    get_data_collector()
+    
+    # Background cleanup of expired rate-limit state
+    app.state.rate_limit_reaper = asyncio.create_task(rate_limiter.run_reaper())
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Log shutdown information"""
     logger.info("👋 Trade Opportunities API Shutting Down")
+    app.state.rate_limit_reaper.cancel()
+    await openai_client.aclose()
+    await close_data_collector()
 
 
 if __name__ == "__main__":
+    import sys
     import uvicorn
     
+    # uvloop and httptools are pinned in requirements.txt; uvloop has no Windows build
     uvicorn.run(
         "main:app",
         host=settings.host,
         port=settings.port,
-        reload=True,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        timeout_keep_alive=settings.timeout_keep_alive,
+        workers=None if settings.reload else settings.workers,
+        reload=settings.reload,
         log_level="info"
     )
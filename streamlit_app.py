@@ -3,11 +3,15 @@ Trade Opportunities Analysis - Streamlit Frontend
 User-friendly interface for sector analysis with citations and PDF export
 """
 import streamlit as st
-import requests
-import json
+import httpx
+import hashlib
+import html
+import orjson
 from datetime import datetime
 from pathlib import Path
-from utils.pdf_generator import generate_pdf
+from utils.ui_templates import (
+    PAGE_CSS, METRIC_CARD, RECOMMENDATION_ITEM, SOURCE_CARD, SOURCE_SNIPPET, SAMPLE_SECTORS_GRID
+)
 
 # Page configuration
 st.set_page_config(
@@ -18,91 +22,94 @@ st.set_page_config(
 )
 
 # Custom CSS for better styling
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 2.5rem;
-        font-weight: 700;
-        color: #1e3a8a;
-        margin-bottom: 0.5rem;
-    }
-    .sub-header {
-        font-size: 1.2rem;
-        color: #64748b;
-        margin-bottom: 2rem;
-    }
-    .metric-card {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        padding: 1.5rem;
-        border-radius: 10px;
-        color: white;
-        margin: 0.5rem 0;
-    }
-    .metric-label {
-        font-size: 0.9rem;
-        opacity: 0.9;
-        margin-bottom: 0.5rem;
-    }
-    .metric-value {
-        font-size: 1.5rem;
-        font-weight: 700;
-    }
-    .source-card {
-        background: #f8fafc;
-        padding: 1rem;
-        border-radius: 8px;
-        border-left: 4px solid #3b82f6;
-        margin: 0.5rem 0;
-    }
-    .source-title {
-        font-weight: 600;
-        color: #1e40af;
-        margin-bottom: 0.3rem;
-    }
-    .source-meta {
-        font-size: 0.85rem;
-        color: #64748b;
-        margin-bottom: 0.3rem;
-    }
-    .recommendation-item {
-        background: #eff6ff;
-        padding: 1rem;
-        border-radius: 8px;
-        margin: 0.5rem 0;
-        border-left: 3px solid #3b82f6;
-        color: #1e293b;
-    }
-    .stButton>button {
-        width: 100%;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        border: none;
-        padding: 0.75rem;
-        font-weight: 600;
-        border-radius: 8px;
-    }
-    .success-box {
-        background: #d1fae5;
-        padding: 1rem;
-        border-radius: 8px;
-        border-left: 4px solid #10b981;
-        margin: 1rem 0;
-    }
-    .error-box {
-        background: #fee2e2;
-        padding: 1rem;
-        border-radius: 8px;
-        border-left: 4px solid #ef4444;
-        margin: 1rem 0;
-    }
-</style>
-""", unsafe_allow_html=True)
+st.markdown(PAGE_CSS, unsafe_allow_html=True)
+
+
+@st.cache_resource
+def get_http() -> httpx.Client:
+    """Process-wide keep-alive client shared by all sessions (httpx.Client is thread-safe)"""
+    # Fail fast when the API is unreachable; the analysis itself may take minutes
+    return httpx.Client(
+        timeout=httpx.Timeout(180.0, connect=10.0),
+        headers={"User-Agent": "trade-opps-streamlit"}
+    )
+
+
+class PartialAnalysis(Exception):
+    """Raised from fetch_analysis so degraded reports are shown but never cached"""
+    
+    def __init__(self, data: dict):
+        super().__init__("Analysis completed with issues")
+        self.data = data
+
+
+@st.cache_data(show_spinner=False, ttl=3600)
+def fetch_analysis(api_url: str, sector: str, api_key_hash: str, _api_key: str) -> dict:
+    """
+    Fetch a sector analysis, reusing responses for an hour
+    
+    The key is cached by its hash only (underscore args are not hashed), so
+    the secret never becomes part of the cache key. Errors and partial runs
+    raise and are not cached, so the next click retries them.
+    """
+    response = get_http().get(f"{api_url}/v1/analyze/{sector}", headers={"X-API-Key": _api_key})
+    response.raise_for_status()
+    data = response.json()
+    if data.get("status") != "success":
+        raise PartialAnalysis(data)
+    return data
+
+
+@st.cache_data(show_spinner=False, max_entries=32, ttl=3600)
+def _cached_pdf(report_id: str, sector: str, markdown_body: str,
+                sources: tuple, data_summary: tuple) -> bytes:
+    """Render a report's PDF once; repeat exports of the same report reuse the bytes"""
+    # Imported on first export so sessions that never export don't load fpdf2
+    from utils.pdf_generator import generate_pdf
+    
+    return generate_pdf(
+        markdown_body=markdown_body,
+        sector=sector,
+        sources=[dict(source) for source in sources],
+        data_summary=dict(data_summary)
+    ).getvalue()  # Immutable bytes: a cached BytesIO would share its read cursor
+
+
+@st.cache_data(show_spinner=False, max_entries=32, ttl=3600)
+def _json_payload(report_id: str, sector: str, timestamp: str, _data: dict) -> bytes:
+    """
+    Serialize a report for download once
+    
+    The underscore arg keeps the dict out of the cache key. Sector and
+    timestamp are part of the key because reports may lack a report_id.
+    """
+    return orjson.dumps(_data, option=orjson.OPT_INDENT_2)
+
+
+def _as_items(mapping: dict) -> tuple:
+    """Hashable, order-independent form of a flat dict (list values become tuples)"""
+    return tuple(sorted(
+        (key, tuple(value) if isinstance(value, list) else value)
+        for key, value in mapping.items()
+    ))
+
+
+# Source cards rendered per "Load more" step
+SOURCES_PAGE_SIZE = 5
+
+
+def _show_more_sources() -> None:
+    # Runs as a button callback, i.e. before the fragment reruns
+    st.session_state.sources_shown += SOURCES_PAGE_SIZE
+
 
 # Initialize session state
 if 'analysis_data' not in st.session_state:
     st.session_state.analysis_data = None
-if 'pdf_bytes' not in st.session_state:
-    st.session_state.pdf_bytes = None
+if 'pdf_buffer' not in st.session_state:
+    st.session_state.pdf_buffer = None
+if 'sources_shown' not in st.session_state:
+    st.session_state.sources_shown = SOURCES_PAGE_SIZE
 
 # Sidebar configuration
 with st.sidebar:
@@ -163,22 +170,27 @@ with col2:
 if analyze_button and sector:
     with st.spinner(f"🔍 Analyzing {sector} sector... This may take 60-90 seconds."):
         try:
-            # Make API request
-            response = requests.get(
-                f"{api_url}/v1/analyze/{sector}",
-                headers={"X-API-Key": api_key},
-                timeout=180
+            # Make API request (repeat queries are served from the cache)
+            st.session_state.analysis_data = fetch_analysis(
+                api_url,
+                sector.strip().lower(),
+                hashlib.sha256(api_key.encode("utf-8")).hexdigest(),
+                api_key
             )
-            
-            if response.status_code == 200:
-                st.session_state.analysis_data = response.json()
-                st.markdown('<div class="success-box">✅ Analysis completed successfully!</div>', unsafe_allow_html=True)
-            elif response.status_code == 429:
+            st.session_state.sources_shown = SOURCES_PAGE_SIZE
+            st.markdown('<div class="success-box">✅ Analysis completed successfully!</div>', unsafe_allow_html=True)
+                
+        except PartialAnalysis as e:
+            st.session_state.analysis_data = e.data
+            st.session_state.sources_shown = SOURCES_PAGE_SIZE
+            st.warning("⚠️ Analysis completed with issues (limited data). Run it again later for a fuller report.")
+        except httpx.HTTPStatusError as e:
+            response = e.response
+            if response.status_code == 429:
                 st.markdown('<div class="error-box">⚠️ Rate limit exceeded. Please wait and try again.</div>', unsafe_allow_html=True)
             else:
                 st.markdown(f'<div class="error-box">❌ Error: {response.status_code} - {response.text}</div>', unsafe_allow_html=True)
-                
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             st.markdown('<div class="error-box">⏱️ Request timeout. The analysis is taking longer than expected. Please try again.</div>', unsafe_allow_html=True)
         except Exception as e:
             st.markdown(f'<div class="error-box">❌ Error: {str(e)}</div>', unsafe_allow_html=True)
@@ -186,6 +198,188 @@ if analyze_button and sector:
 elif analyze_button:
     st.warning("⚠️ Please enter a sector name")
 
+
+# Results view: each tab is a fragment, so widgets inside a tab rerun only that tab
+@st.fragment
+def render_overview(data: dict) -> None:
+    """Overview tab: key metrics, recommendations and report metadata"""
+    st.markdown("### 📈 Key Metrics")
+    
+    # Display metrics in cards
+    col1, col2, col3 = st.columns(3)
+    
+    data_summary = data.get('data_summary', {})
+    
+    with col1:
+        st.markdown(METRIC_CARD.substitute(
+            label="Market Size",
+            value=html.escape(data_summary.get('market_size') or 'Not Available')
+        ), unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown(METRIC_CARD.substitute(
+            label="Growth Rate",
+            value=html.escape(data_summary.get('growth_cagr') or 'Not Available')
+        ), unsafe_allow_html=True)
+    
+    with col3:
+        st.markdown(METRIC_CARD.substitute(
+            label="Recommendations",
+            value=f"{len(data_summary.get('top_recommendations', []))} Actions"
+        ), unsafe_allow_html=True)
+    
+    # Top Recommendations
+    st.markdown("### 🎯 Top Actionable Recommendations")
+    recommendations = data_summary.get('top_recommendations', [])
+    
+    if recommendations:
+        # One markdown element for the whole list instead of one per item
+        st.markdown("\n".join(
+            RECOMMENDATION_ITEM.substitute(index=idx, text=html.escape(rec))
+            for idx, rec in enumerate(recommendations, 1)
+        ), unsafe_allow_html=True)
+    else:
+        st.info("No specific recommendations extracted.")
+    
+    # Metadata
+    st.markdown("---")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.markdown(f"**Report ID:** `{data.get('report_id', 'N/A')}`")
+    with col2:
+        st.markdown(f"**Sector:** {data.get('sector', 'N/A').title()}")
+    with col3:
+        timestamp = data.get('timestamp', '')
+        if timestamp:
+            try:
+                dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+                st.markdown(f"**Generated:** {dt.strftime('%B %d, %Y %H:%M UTC')}")
+            except:
+                st.markdown(f"**Generated:** {timestamp}")
+
+
+@st.fragment
+def render_report(data: dict) -> None:
+    """Full report tab"""
+    st.markdown("### 📄 Complete Analysis Report")
+    markdown_body = data.get('markdown_body', '')
+    
+    if markdown_body:
+        st.markdown(markdown_body)
+    else:
+        st.warning("No report content available.")
+
+
+def _source_card(idx: int, source: dict) -> str:
+    """HTML card for one source"""
+    # Titles and snippets come from scraped pages: escape before embedding as HTML
+    snippet = source.get('snippet')
+    return SOURCE_CARD.substitute(
+        index=idx,
+        title=html.escape(source.get('title', 'No Title')),
+        source=html.escape(source.get('source', 'Unknown Source')),
+        url=html.escape(source.get('url', '#')),
+        url_text=html.escape(source.get('url', 'No URL')),
+        snippet=SOURCE_SNIPPET.substitute(snippet=html.escape(snippet)) if snippet else ''
+    )
+
+
+@st.fragment
+def render_sources(data: dict) -> None:
+    """Sources tab: cited articles"""
+    st.markdown("### 📚 Sources & Citations")
+    sources = data.get('sources', [])
+    
+    if sources:
+        st.info(f"📊 Total sources cited: **{len(sources)}**")
+        
+        # All shown cards go out as one markdown element instead of one per source
+        shown = st.session_state.sources_shown
+        st.markdown("\n".join(
+            _source_card(idx, source) for idx, source in enumerate(sources[:shown], 1)
+        ), unsafe_allow_html=True)
+        
+        if shown < len(sources):
+            st.button(
+                f"Load {min(SOURCES_PAGE_SIZE, len(sources) - shown)} more",
+                on_click=_show_more_sources,
+                use_container_width=True
+            )
+    else:
+        st.warning("No sources available for this analysis.")
+
+
+@st.fragment
+def render_export(data: dict) -> None:
+    """Export tab: PDF, markdown and JSON downloads"""
+    st.markdown("### 💾 Export Options")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("#### 📄 Download as PDF")
+        st.markdown("Generate a professional PDF report with full analysis and citations.")
+        
+        if st.button("📥 Generate & Download PDF", use_container_width=True):
+            with st.spinner("Generating PDF..."):
+                try:
+                    st.session_state.pdf_buffer = _cached_pdf(
+                        report_id=data.get('report_id', ''),
+                        sector=data.get('sector', 'Unknown'),
+                        markdown_body=data.get('markdown_body', ''),
+                        sources=tuple(_as_items(source) for source in data.get('sources', [])),
+                        data_summary=_as_items(data.get('data_summary', {}))
+                    )
+                    st.success("✅ PDF generated successfully!")
+                except Exception as e:
+                    st.error(f"❌ PDF generation failed: {str(e)}")
+        
+        if st.session_state.pdf_buffer is not None:
+            date_suffix = datetime.now().strftime('%Y%m%d')
+            sector_name = data.get('sector', 'analysis')
+            st.download_button(
+                label="📥 Download PDF File",
+                data=st.session_state.pdf_buffer,
+                file_name=f"{sector_name}_{date_suffix}.pdf",
+                mime="application/pdf",
+                use_container_width=True
+            )
+    
+    with col2:
+        st.markdown("#### 📋 Download as Markdown")
+        st.markdown("Get the raw markdown file for custom processing.")
+        
+        if markdown_content := data.get('markdown_body'):
+            date_suffix = datetime.now().strftime('%Y%m%d')
+            sector_name = data.get('sector', 'analysis')
+            st.download_button(
+                label="📥 Download Markdown File",
+                data=markdown_content,
+                file_name=f"{sector_name}_{date_suffix}.md",
+                mime="text/markdown",
+                use_container_width=True
+            )
+    
+    st.markdown("---")
+    st.markdown("#### 📊 Raw JSON Data")
+    st.markdown("Access the complete API response in JSON format.")
+    
+    with st.expander("View JSON Response"):
+        st.json(data)
+    
+    date_suffix = datetime.now().strftime('%Y%m%d')
+    sector_name = data.get('sector', 'analysis')
+    st.download_button(
+        label="📥 Download JSON File",
+        data=_json_payload(
+            data.get('report_id', ''), data.get('sector', ''), data.get('timestamp', ''), data
+        ),
+        file_name=f"{sector_name}_{date_suffix}.json",
+        mime="application/json",
+        use_container_width=True
+    )
+
+
 # Display results
 if st.session_state.analysis_data:
     data = st.session_state.analysis_data
@@ -195,193 +389,26 @@ if st.session_state.analysis_data:
     
     # Tab 1: Overview
     with tab1:
-        st.markdown("### 📈 Key Metrics")
-        
-        # Display metrics in cards
-        col1, col2, col3 = st.columns(3)
-        
-        data_summary = data.get('data_summary', {})
-        
-        with col1:
-            st.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-label">Market Size</div>
-                <div class="metric-value">{data_summary.get('market_size', 'Not Available')}</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col2:
-            st.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-label">Growth Rate</div>
-                <div class="metric-value">{data_summary.get('growth_cagr', 'Not Available')}</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col3:
-            st.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-label">Recommendations</div>
-                <div class="metric-value">{len(data_summary.get('top_recommendations', []))} Actions</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        # Top Recommendations
-        st.markdown("### 🎯 Top Actionable Recommendations")
-        recommendations = data_summary.get('top_recommendations', [])
-        
-        if recommendations:
-            for idx, rec in enumerate(recommendations, 1):
-                st.markdown(f"""
-                <div class="recommendation-item">
-                    <strong>{idx}.</strong> {rec}
-                </div>
-                """, unsafe_allow_html=True)
-        else:
-            st.info("No specific recommendations extracted.")
-        
-        # Metadata
-        st.markdown("---")
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.markdown(f"**Report ID:** `{data.get('report_id', 'N/A')}`")
-        with col2:
-            st.markdown(f"**Sector:** {data.get('sector', 'N/A').title()}")
-        with col3:
-            timestamp = data.get('timestamp', '')
-            if timestamp:
-                try:
-                    dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                    st.markdown(f"**Generated:** {dt.strftime('%B %d, %Y %H:%M UTC')}")
-                except:
-                    st.markdown(f"**Generated:** {timestamp}")
+        render_overview(data)
     
     # Tab 2: Full Report
     with tab2:
-        st.markdown("### 📄 Complete Analysis Report")
-        markdown_body = data.get('markdown_body', '')
-        
-        if markdown_body:
-            st.markdown(markdown_body)
-        else:
-            st.warning("No report content available.")
+        render_report(data)
     
     # Tab 3: Sources
     with tab3:
-        st.markdown("### 📚 Sources & Citations")
-        sources = data.get('sources', [])
-        
-        if sources:
-            st.info(f"📊 Total sources cited: **{len(sources)}**")
-            
-            for idx, source in enumerate(sources, 1):
-                st.markdown(f"""
-                <div class="source-card">
-                    <div class="source-title">{idx}. {source.get('title', 'No Title')}</div>
-                    <div class="source-meta">📰 {source.get('source', 'Unknown Source')}</div>
-                    <a href="{source.get('url', '#')}" target="_blank" style="color: #3b82f6; text-decoration: none;">
-                        🔗 {source.get('url', 'No URL')}
-                    </a>
-                    {f'<p style="margin-top: 0.5rem; font-size: 0.9rem; color: #475569;">{source.get("snippet", "")}</p>' if source.get('snippet') else ''}
-                </div>
-                """, unsafe_allow_html=True)
-        else:
-            st.warning("No sources available for this analysis.")
+        render_sources(data)
     
     # Tab 4: Export
     with tab4:
-        st.markdown("### 💾 Export Options")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("#### 📄 Download as PDF")
-            st.markdown("Generate a professional PDF report with full analysis and citations.")
-            
-            if st.button("📥 Generate & Download PDF", use_container_width=True):
-                with st.spinner("Generating PDF..."):
-                    try:
-                        pdf_bytes = generate_pdf(
-                            markdown_body=data.get('markdown_body', ''),
-                            sector=data.get('sector', 'Unknown'),
-                            sources=data.get('sources', []),
-                            data_summary=data.get('data_summary', {})
-                        )
-                        st.session_state.pdf_bytes = pdf_bytes
-                        st.success("✅ PDF generated successfully!")
-                    except Exception as e:
-                        st.error(f"❌ PDF generation failed: {str(e)}")
-            
-            if st.session_state.pdf_bytes:
-                date_suffix = datetime.now().strftime('%Y%m%d')
-                sector_name = data.get('sector', 'analysis')
-                st.download_button(
-                    label="📥 Download PDF File",
-                    data=st.session_state.pdf_bytes,
-                    file_name=f"{sector_name}_{date_suffix}.pdf",
-                    mime="application/pdf",
-                    use_container_width=True
-                )
-        
-        with col2:
-            st.markdown("#### 📋 Download as Markdown")
-            st.markdown("Get the raw markdown file for custom processing.")
-            
-            if markdown_content := data.get('markdown_body'):
-                date_suffix = datetime.now().strftime('%Y%m%d')
-                sector_name = data.get('sector', 'analysis')
-                st.download_button(
-                    label="📥 Download Markdown File",
-                    data=markdown_content,
-                    file_name=f"{sector_name}_{date_suffix}.md",
-                    mime="text/markdown",
-                    use_container_width=True
-                )
-        
-        st.markdown("---")
-        st.markdown("#### 📊 Raw JSON Data")
-        st.markdown("Access the complete API response in JSON format.")
-        
-        with st.expander("View JSON Response"):
-            st.json(data)
-        
-        date_suffix = datetime.now().strftime('%Y%m%d')
-        sector_name = data.get('sector', 'analysis')
-        st.download_button(
-            label="📥 Download JSON File",
-            data=json.dumps(data, indent=2),
-            file_name=f"{sector_name}_{date_suffix}.json",
-            mime="application/json",
-            use_container_width=True
-        )
+        render_export(data)
 
 else:
     # Welcome message when no analysis
     st.info("👆 Enter a sector name above and click 'Analyze Sector' to get started!")
     
     st.markdown("### 🌟 Sample Sectors")
-    col1, col2, col3, col4 = st.columns(4)
-    
-    sample_sectors = [
-        ("💊", "Pharmaceuticals"),
-        ("🧵", "Textiles"),
-        ("🌾", "Agriculture"),
-        ("💻", "Technology"),
-        ("🏗️", "Construction"),
-        ("⚡", "Energy"),
-        ("🚗", "Automotive"),
-        ("🏭", "Manufacturing")
-    ]
-    
-    for idx, (icon, name) in enumerate(sample_sectors):
-        col = [col1, col2, col3, col4][idx % 4]
-        with col:
-            st.markdown(f"""
-            <div style="background: #f8fafc; padding: 1rem; border-radius: 8px; text-align: center; margin: 0.5rem 0;">
-                <div style="font-size: 2rem;">{icon}</div>
-                <div style="font-weight: 600; color: #1e40af;">{name}</div>
-            </div>
-            """, unsafe_allow_html=True)
+    st.markdown(SAMPLE_SECTORS_GRID, unsafe_allow_html=True)
 
 # Footer
 st.markdown("---")
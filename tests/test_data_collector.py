@@ -0,0 +1,21 @@
+"""Tests for the data collector's source scoring"""
+import pytest
+
+data_collector = pytest.importorskip("external_tools.data_collector")
+
+
+@pytest.mark.parametrize("domain, parent", [
+    ("reuters.com", "reuters.com"),
+    ("markets.reuters.com", "reuters.com"),
+    ("www.markets.reuters.com", "reuters.com"),
+    ("in.finance.yahoo.com", "finance.yahoo.com"),
+])
+def test_subdomains_inherit_the_closest_registered_score(monkeypatch, domain, parent):
+    scores = {**data_collector._SOURCE_SCORES, "reuters.com": 40, "finance.yahoo.com": 20}
+    monkeypatch.setattr(data_collector, "_SOURCE_SCORES", scores)
+    assert data_collector._source_bonus(domain) == scores[parent]
+
+
+def test_unknown_domain_has_no_bonus():
+    assert data_collector._source_bonus("example.org") is None
+    assert data_collector._source_bonus("") is None
@@ -0,0 +1,36 @@
+"""Tests for the regex report extractors"""
+import pytest
+
+from analysis_engine.extractors import extract_recommendations
+
+ITEMS = "1. Export generics to Africa\n2. **Partner** with CDMOs\n- Apply for PLI incentives\n"
+
+
+@pytest.mark.parametrize("header", [
+    "## Actionable Recommendations",
+    "## Actionable Recommendations (Top 5)",
+    "### Actionable Recommendations",
+    "## **Actionable Recommendations**",
+    "### **Top Opportunities** for 2025",
+    "## actionable recommendations",
+])
+def test_recommendation_header_variants(header):
+    report = f"## Market Overview\n- Not a recommendation\n\n{header}\n{ITEMS}\n## Market Outlook\n- Later item\n"
+    assert extract_recommendations(report) == [
+        "Export generics to Africa",
+        "Partner with CDMOs",
+        "Apply for PLI incentives",
+    ]
+
+
+def test_section_includes_subheadings_until_same_level_header():
+    report = (
+        "## Actionable Recommendations\n### Short term\n- First\n### Long term\n- Second\n"
+        "## Market Outlook\n- Not included\n"
+    )
+    assert extract_recommendations(report) == ["First", "Second"]
+
+
+def test_unrelated_headers_are_ignored():
+    assert extract_recommendations("# Actionable Recommendations\n- Too high a level\n") == []
+    assert extract_recommendations("## Recommendations Summary\n- Other section\n") == []
@@ -0,0 +1,22 @@
+"""Tests for the PDF generator's markdown stripping"""
+import pytest
+
+pytest.importorskip("fpdf")
+
+from utils.pdf_generator import markdown_to_text
+
+
+def test_bold_wrapped_link_keeps_link_text():
+    assert markdown_to_text("**[Reuters](http://x)**") == "Reuters"
+
+
+def test_bold_italic_is_fully_stripped():
+    assert markdown_to_text("***bold italic***") == "bold italic"
+
+
+def test_italic_wrapped_link_keeps_link_text():
+    assert markdown_to_text("*see [x](u)*") == "see x"
+
+
+def test_headers_are_dropped():
+    assert markdown_to_text("## Market Overview\nBody") == "Market Overview\nBody"
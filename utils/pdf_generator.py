@@ -4,13 +4,43 @@ Converts markdown reports to professional PDF documents with citations
 Uses fpdf2 (pure Python - no system dependencies)
 """
 from fpdf import FPDF
-from markdown2 import markdown
 from datetime import datetime
+import io
 import logging
 import re
 
 logger = logging.getLogger(__name__)
 
+# Markdown to plain text, compiled once. Applied in this order (not as one
+# alternation) so markup nested in other markup, e.g. **[Source](url)** or
+# ***text***, is stripped too
+_HEADER_RE = re.compile(r'^#{1,6}\s+', re.MULTILINE)
+_BOLD_RE = re.compile(r'\*\*([^*]+)\*\*')
+_ITALIC_RE = re.compile(r'\*([^*]+)\*')
+_LINK_RE = re.compile(r'\[([^\]]+)\]\([^\)]+\)')
+
+
+def markdown_to_text(markdown_body: str) -> str:
+    """Strip headers, bold/italic and links, keeping their text"""
+    text = _HEADER_RE.sub('', markdown_body)
+    text = _BOLD_RE.sub(r'\1', text)
+    text = _ITALIC_RE.sub(r'\1', text)
+    return _LINK_RE.sub(r'\1', text)
+
+
+# Core PDF fonts (Arial) are latin-1 only: map common report characters to
+# close equivalents, anything else (e.g. emoji) becomes '?'
+_LATIN1_FALLBACKS = str.maketrans({
+    '\u2018': "'", '\u2019': "'", '\u201c': '"', '\u201d': '"',
+    '\u2013': '-', '\u2014': '-', '\u2022': '-', '\u2026': '...',
+    '\u20b9': 'Rs.', '\u00a0': ' ',
+})
+
+
+def _latin1(text: str) -> str:
+    """Make scraped or generated text safe for fpdf's latin-1 core fonts"""
+    return text.translate(_LATIN1_FALLBACKS).encode('latin-1', 'replace').decode('latin-1')
+
 
 class PDFReport(FPDF):
     """Custom PDF class with header and footer"""
@@ -35,7 +65,7 @@ class PDFReport(FPDF):
         self.cell(0, 10, f'Page {self.page_no()}', 0, 0, 'C')
 
 
-def generate_pdf(markdown_body: str, sector: str, sources: list, data_summary: dict) -> bytes:
+def generate_pdf(markdown_body: str, sector: str, sources: list, data_summary: dict) -> io.BytesIO:
     """
     Generate PDF from markdown report
     
@@ -46,13 +76,13 @@ def generate_pdf(markdown_body: str, sector: str, sources: list, data_summary: d
         data_summary: Summary data dictionary
         
     Returns:
-        PDF file as bytes
+        PDF file in a buffer positioned at the start
     """
     try:
         # Create PDF
         pdf = PDFReport(
             title='Trade Opportunities Analysis',
-            sector=sector.title()
+            sector=_latin1(sector.title())
         )
         pdf.add_page()
         pdf.set_auto_page_break(auto=True, margin=15)
@@ -63,9 +93,9 @@ def generate_pdf(markdown_body: str, sector: str, sources: list, data_summary: d
         pdf.set_font('Arial', '', 11)
         
         if data_summary.get('market_size'):
-            pdf.multi_cell(0, 8, f"Market Size: {data_summary['market_size']}")
+            pdf.multi_cell(0, 8, _latin1(f"Market Size: {data_summary['market_size']}"))
         if data_summary.get('growth_cagr'):
-            pdf.multi_cell(0, 8, f"Growth Rate: {data_summary['growth_cagr']}")
+            pdf.multi_cell(0, 8, _latin1(f"Growth Rate: {data_summary['growth_cagr']}"))
         
         pdf.ln(5)
         
@@ -75,28 +105,22 @@ def generate_pdf(markdown_body: str, sector: str, sources: list, data_summary: d
         pdf.set_font('Arial', '', 10)
         
         # Simple markdown to text conversion
-        text_content = markdown_body
-        # Remove markdown headers
-        text_content = re.sub(r'^#{1,6}\s+', '', text_content, flags=re.MULTILINE)
-        # Remove markdown bold/italic
-        text_content = re.sub(r'\*\*([^*]+)\*\*', r'\1', text_content)
-        text_content = re.sub(r'\*([^*]+)\*', r'\1', text_content)
-        # Remove markdown links but keep text
-        text_content = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', text_content)
+        text_content = _latin1(markdown_to_text(markdown_body))
         
-        # Split into paragraphs and add to PDF
-        paragraphs = text_content.split('\n\n')
-        for para in paragraphs:
-            if para.strip():
-                # Handle bullet points
-                if para.strip().startswith('-'):
-                    lines = para.split('\n')
-                    for line in lines:
-                        if line.strip():
-                            pdf.multi_cell(0, 6, line.strip())
-                else:
-                    pdf.multi_cell(0, 6, para.strip())
-                pdf.ln(3)
+        # Split into paragraphs and add to PDF; the body font is set once above
+        for para in text_content.split('\n\n'):
+            para = para.strip()
+            if not para:
+                continue
+            # Handle bullet points
+            if para.startswith('-'):
+                for line in para.split('\n'):
+                    line = line.strip()
+                    if line:
+                        pdf.multi_cell(0, 6, line)
+            else:
+                pdf.multi_cell(0, 6, para)
+            pdf.ln(3)
         
         # Add sources
         if sources:
@@ -107,10 +131,10 @@ def generate_pdf(markdown_body: str, sector: str, sources: list, data_summary: d
             
             for idx, source in enumerate(sources[:10], 1):
                 pdf.set_font('Arial', 'B', 9)
-                pdf.multi_cell(0, 5, f"{idx}. {source.get('title', 'No Title')}")
+                pdf.multi_cell(0, 5, _latin1(f"{idx}. {source.get('title', 'No Title')}"))
                 pdf.set_font('Arial', '', 8)
-                pdf.multi_cell(0, 4, f"Source: {source.get('source', 'Unknown')}")
-                pdf.multi_cell(0, 4, f"URL: {source.get('url', 'No URL')}")
+                pdf.multi_cell(0, 4, _latin1(f"Source: {source.get('source', 'Unknown')}"))
+                pdf.multi_cell(0, 4, _latin1(f"URL: {source.get('url', 'No URL')}"))
                 pdf.ln(2)
         
         # Generate timestamp
@@ -118,8 +142,11 @@ def generate_pdf(markdown_body: str, sector: str, sources: list, data_summary: d
         pdf.ln(5)
         pdf.cell(0, 5, f'Generated on: {datetime.utcnow().strftime("%B %d, %Y at %H:%M UTC")}', 0, 1, 'C')
         
-        # Return PDF as bytes
-        return bytes(pdf.output())
+        # Write the PDF straight into the returned buffer (no extra bytes copy)
+        buf = io.BytesIO()
+        pdf.output(buf)
+        buf.seek(0)
+        return buf
         
     except Exception as e:
         logger.error(f"PDF generation error: {e}")
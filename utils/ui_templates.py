@@ -0,0 +1,131 @@
+"""
+UI Templates
+Static CSS and HTML card markup for the Streamlit frontend
+Lives outside streamlit_app.py, which Streamlit re-executes on every rerun,
+so these are built once per process
+"""
+from string import Template
+
+PAGE_CSS = """
+<style>
+    .main-header {
+        font-size: 2.5rem;
+        font-weight: 700;
+        color: #1e3a8a;
+        margin-bottom: 0.5rem;
+    }
+    .sub-header {
+        font-size: 1.2rem;
+        color: #64748b;
+        margin-bottom: 2rem;
+    }
+    .metric-card {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        padding: 1.5rem;
+        border-radius: 10px;
+        color: white;
+        margin: 0.5rem 0;
+    }
+    .metric-label {
+        font-size: 0.9rem;
+        opacity: 0.9;
+        margin-bottom: 0.5rem;
+    }
+    .metric-value {
+        font-size: 1.5rem;
+        font-weight: 700;
+    }
+    .source-card {
+        background: #f8fafc;
+        padding: 1rem;
+        border-radius: 8px;
+        border-left: 4px solid #3b82f6;
+        margin: 0.5rem 0;
+    }
+    .source-title {
+        font-weight: 600;
+        color: #1e40af;
+        margin-bottom: 0.3rem;
+    }
+    .source-meta {
+        font-size: 0.85rem;
+        color: #64748b;
+        margin-bottom: 0.3rem;
+    }
+    .recommendation-item {
+        background: #eff6ff;
+        padding: 1rem;
+        border-radius: 8px;
+        margin: 0.5rem 0;
+        border-left: 3px solid #3b82f6;
+        color: #1e293b;
+    }
+    .stButton>button {
+        width: 100%;
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        color: white;
+        border: none;
+        padding: 0.75rem;
+        font-weight: 600;
+        border-radius: 8px;
+    }
+    .success-box {
+        background: #d1fae5;
+        padding: 1rem;
+        border-radius: 8px;
+        border-left: 4px solid #10b981;
+        margin: 1rem 0;
+    }
+    .error-box {
+        background: #fee2e2;
+        padding: 1rem;
+        border-radius: 8px;
+        border-left: 4px solid #ef4444;
+        margin: 1rem 0;
+    }
+</style>
+"""
+
+METRIC_CARD = Template("""<div class="metric-card">
+    <div class="metric-label">$label</div>
+    <div class="metric-value">$value</div>
+</div>""")
+
+RECOMMENDATION_ITEM = Template("""<div class="recommendation-item">
+    <strong>$index.</strong> $text
+</div>""")
+
+SOURCE_CARD = Template("""<div class="source-card">
+    <div class="source-title">$index. $title</div>
+    <div class="source-meta">📰 $source</div>
+    <a href="$url" target="_blank" style="color: #3b82f6; text-decoration: none;">
+        🔗 $url_text
+    </a>$snippet
+</div>""")
+
+# Cards of one list are joined and sent as a single markdown element, so no
+# template may contain a blank line (it would end the HTML block)
+SOURCE_SNIPPET = Template('<p style="margin-top: 0.5rem; font-size: 0.9rem; color: #475569;">$snippet</p>')
+
+_SAMPLE_SECTORS = [
+    ("💊", "Pharmaceuticals"),
+    ("🧵", "Textiles"),
+    ("🌾", "Agriculture"),
+    ("💻", "Technology"),
+    ("🏗️", "Construction"),
+    ("⚡", "Energy"),
+    ("🚗", "Automotive"),
+    ("🏭", "Manufacturing")
+]
+
+_SAMPLE_SECTOR_CARD = Template("""<div style="background: #f8fafc; padding: 1rem; border-radius: 8px; text-align: center;">
+    <div style="font-size: 2rem;">$icon</div>
+    <div style="font-weight: 600; color: #1e40af;">$name</div>
+</div>""")
+
+# Welcome-screen grid of sample sectors (4 per row), fully static
+SAMPLE_SECTORS_GRID = (
+    '<div style="display: grid; grid-template-columns: repeat(4, 1fr); gap: 1rem; margin: 0.5rem 0;">\n'
+    + "\n".join(_SAMPLE_SECTOR_CARD.substitute(icon=icon, name=name) for icon, name in _SAMPLE_SECTORS)
+    + "\n</div>"
+)